@@ -1,22 +1,416 @@
 #!/usr/bin/env python3
 
-import argparse
+import asyncio
+import collections
+import functools
+import importlib.util
 import logging
+import logging.handlers
+import os
+import shutil
 import signal
 import subprocess
 import sys
+import threading
 import time
-from datetime import datetime
-from typing import Optional, List, Union
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+from types import SimpleNamespace
+from typing import Dict, Optional, List, Tuple, Union
+
+try:
+    import httpx
+except ImportError:
+    # Fall back to spawning the curl binary when httpx is not installed
+    httpx = None
+
+try:
+    import pycurl
+except ImportError:
+    # Drive libcurl directly when its bindings are installed; otherwise use
+    # httpx or the curl binary
+    pycurl = None
+
+try:
+    import uvloop
+except ImportError:
+    # The asyncio runners use the default event loop without uvloop
+    uvloop = None
+
+# HTTP/2 support in httpx requires the optional h2 package
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+class _BufferedLogHandler(logging.handlers.MemoryHandler):
+    """
+    A MemoryHandler that also flushes its records at most a second after they are logged.
+    
+    Tight loops write their log lines in blocks instead of one write per
+    record, while a timer makes sure slow loops still see each line within
+    a second, even when nothing else is logged after it.
+    """
+    
+    def __init__(self, capacity: int, flush_interval: float = 1.0, **kwargs):
+        super().__init__(capacity, **kwargs)
+        self.flush_interval = flush_interval
+        self._timer = None
+    
+    def emit(self, record):
+        super().emit(record)
+        # Called with the handler lock held, so only one timer is ever pending
+        if self.buffer and self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def flush(self):
+        self.acquire()
+        try:
+            super().flush()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        finally:
+            self.release()
+
+# Configure logging. Records are buffered and written in blocks; errors are
+# written immediately.
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+_log_handler = _BufferedLogHandler(1024, flushLevel=logging.ERROR, target=_stream_handler)
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
 logger = logging.getLogger(__name__)
 
+# httpx logs every request at INFO, which would duplicate our own iteration logs
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Iterations handed to a single curl process before starting a new one
+CURL_BATCH_SIZE = 1000
+
+# curl gives up on connecting after this many seconds unless told otherwise
+CURL_CONNECT_TIMEOUT = 300
+
+# Marker written by curl after each transfer, followed by its exit code, duration
+# and error message. It goes to stderr, which curl doesn't buffer, so each result
+# arrives as soon as its transfer ends instead of with the next transfer's output.
+CURL_RESULT_MARKER = b"__curl_loop_result__ "
+CURL_RESULT_FORMAT = "%{stderr}\n" + CURL_RESULT_MARKER.decode() + "%{exitcode} %{time_total} %{errormsg}\n"
+
+# curl flags without a value that can be reproduced by the in-process client
+CURL_FLAGS = {
+    "-s": "silent", "--silent": "silent",
+    "-S": "show_error", "--show-error": "show_error",
+    "-f": "fail", "--fail": "fail",
+    "-L": "location", "--location": "location",
+    "-k": "insecure", "--insecure": "insecure",
+    "-g": "globoff", "--globoff": "globoff",
+    "--compressed": "compressed",
+    "--http1.1": "http1.1",
+    "--http2": "http2",
+}
+
+# curl options taking a value that can be reproduced by the in-process client
+CURL_OPTIONS = {
+    "-X": "request", "--request": "request",
+    "-H": "header", "--header": "header",
+    "-d": "data", "--data": "data",
+    "--data-ascii": "data", "--data-binary": "data",
+    "--data-raw": "data_raw",
+    "-A": "user_agent", "--user-agent": "user_agent",
+    "-e": "referer", "--referer": "referer",
+    "-u": "user", "--user": "user",
+    "-m": "max_time", "--max-time": "max_time",
+    "--url": "url",
+}
+
+def parse_curl_args(args: List[str]) -> Optional[dict]:
+    """
+    Translate a subset of curl arguments into an HTTP request description.
+    
+    Args:
+        args: The curl arguments, without the leading 'curl'.
+    
+    Returns:
+        A dict describing the request, or None if the arguments use a curl
+        feature that cannot be reproduced in-process.
+    """
+    request = {
+        "method": None,
+        "url": None,
+        "headers": [],
+        "content": None,
+        "fail": False,
+        "follow_redirects": False,
+        "verify": True,
+        "http2": HTTP2_AVAILABLE,
+        "http_version": None,
+        "compressed": False,
+        "auth": None,
+        "timeout": None,
+    }
+    data = []
+    
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        i += 1
+        
+        if not arg.startswith("-") or arg == "-":
+            # A positional argument is the URL; curl accepts several but we only loop one
+            if request["url"] is not None:
+                return None
+            request["url"] = arg
+            continue
+        
+        if arg in CURL_FLAGS:
+            flags = [CURL_FLAGS[arg]]
+        elif arg in CURL_OPTIONS:
+            if i >= len(args):
+                return None
+            flags = [(CURL_OPTIONS[arg], args[i])]
+            i += 1
+        elif not arg.startswith("--") and len(arg) > 2:
+            # Short options can be combined ("-sSL") or carry their value ("-XPOST")
+            if arg[:2] in CURL_OPTIONS:
+                flags = [(CURL_OPTIONS[arg[:2]], arg[2:])]
+            elif all(f"-{c}" in CURL_FLAGS for c in arg[1:]):
+                flags = [CURL_FLAGS[f"-{c}"] for c in arg[1:]]
+            else:
+                return None
+        else:
+            return None
+        
+        for flag in flags:
+            if flag == "fail":
+                request["fail"] = True
+            elif flag == "location":
+                request["follow_redirects"] = True
+            elif flag == "insecure":
+                request["verify"] = False
+            elif flag == "http1.1":
+                request["http2"] = False
+                request["http_version"] = "1.1"
+            elif flag == "http2":
+                request["http_version"] = "2"
+            elif flag == "compressed":
+                request["compressed"] = True
+            elif isinstance(flag, tuple):
+                name, value = flag
+                if name == "request":
+                    request["method"] = value.upper()
+                elif name == "header":
+                    header = _parse_header(value)
+                    if header is None:
+                        return None
+                    request["headers"].append(header)
+                elif name == "data":
+                    # Reading the body from a file is left to curl itself
+                    if value.startswith("@"):
+                        return None
+                    data.append(value)
+                elif name == "data_raw":
+                    data.append(value)
+                elif name == "user_agent":
+                    request["headers"].append(("User-Agent", value or None))
+                elif name == "referer":
+                    request["headers"].append(("Referer", value))
+                elif name == "user":
+                    username, _, password = value.partition(":")
+                    request["auth"] = (username, password)
+                elif name == "max_time":
+                    try:
+                        request["timeout"] = float(value)
+                    except ValueError:
+                        return None
+                elif name == "url":
+                    if request["url"] is not None:
+                        return None
+                    request["url"] = value
+    
+    if request["url"] is None:
+        return None
+    
+    # curl assumes http:// when the URL has no scheme
+    if "://" not in request["url"]:
+        request["url"] = f"http://{request['url']}"
+    
+    if data:
+        request["content"] = "&".join(data).encode()
+        header_names = {name.lower() for name, _ in request["headers"]}
+        if "content-type" not in header_names:
+            request["headers"].append(("Content-Type", "application/x-www-form-urlencoded"))
+    
+    if request["method"] is None:
+        request["method"] = "POST" if data else "GET"
+    
+    return request
+
+def _parse_header(value: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Parse a -H argument the way curl does.
+    
+    "Name: value" sets a header, "Name:" removes one curl would otherwise
+    send and "Name;" sends it with an empty value.
+    
+    Args:
+        value: The argument given to -H.
+    
+    Returns:
+        A (name, value) tuple with a value of None for a removed header,
+        or None if the argument isn't a header curl would send.
+    """
+    header_name, sep, header_value = value.partition(":")
+    if sep:
+        header_value = header_value.strip()
+        return (header_name.strip(), header_value or None)
+    if value.endswith(";") and value[:-1].strip():
+        return (value[:-1].strip(), "")
+    return None
+
+@functools.lru_cache(maxsize=None)
+def resolve_executable(name: str) -> str:
+    """
+    Find a program on PATH once per process.
+    
+    Args:
+        name: The program name, or a path to it.
+    
+    Returns:
+        The program's absolute path, or the name itself if it isn't on PATH.
+    """
+    return shutil.which(name) or name
+
+@functools.lru_cache(maxsize=None)
+def curl_version() -> Optional[str]:
+    """
+    Get the version of the installed curl binary.
+    
+    Returns:
+        The version string, e.g. "7.88.1", or None if curl can't be run.
+    """
+    try:
+        output = subprocess.run(
+            ["curl", "--version"],
+            executable=resolve_executable("curl"),
+            close_fds=False,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        return output.split()[1]
+    except Exception:
+        return None
+
+def curl_user_agent() -> str:
+    """
+    Get the User-Agent the installed curl binary sends by default.
+    
+    Returns:
+        The User-Agent header value, e.g. "curl/7.88.1".
+    """
+    version = curl_version()
+    return f"curl/{version}" if version else "curl"
+
+def curl_supports_rate() -> bool:
+    """
+    Check whether the installed curl understands --rate (curl 7.84.0 and later).
+    
+    Returns:
+        True if a single curl process can pace repeated transfers itself.
+    """
+    try:
+        version = tuple(int(part) for part in curl_version().split(".")[:2])
+    except Exception:
+        return False
+    return version >= (7, 84)
+
+def request_headers(request: Dict) -> List[Tuple[str, str]]:
+    """
+    Get the headers to send for a parsed request, leaving out removed ones.
+    
+    Args:
+        request: A request parsed by parse_curl_args.
+    
+    Returns:
+        The (name, value) pairs to send.
+    """
+    return [(name, value) for name, value in request["headers"] if value is not None]
+
+def use_curl_default_headers(client, request: Dict) -> None:
+    """
+    Make an httpx client send the default headers curl would instead of its own.
+    
+    Args:
+        client: The httpx.Client or httpx.AsyncClient to adjust.
+        request: The request parsed by parse_curl_args that the client will send.
+    """
+    client.headers["User-Agent"] = curl_user_agent()
+    client.headers["Accept"] = "*/*"
+    client.headers.pop("Connection", None)
+    if not request["compressed"]:
+        client.headers.pop("Accept-Encoding", None)
+    for name, value in request["headers"]:
+        if value is None:
+            client.headers.pop(name, None)
+
+def client_timeout(request: Dict):
+    """
+    Build the httpx timeout matching curl's for a parsed request.
+    
+    Like curl, there is no limit on the transfer itself unless --max-time is
+    given, but connecting gives up after curl's default connect timeout.
+    
+    Args:
+        request: A request parsed by parse_curl_args.
+    
+    Returns:
+        The httpx.Timeout to use.
+    """
+    timeout = request["timeout"]
+    connect = CURL_CONNECT_TIMEOUT if timeout is None else min(timeout, CURL_CONNECT_TIMEOUT)
+    return httpx.Timeout(timeout, connect=connect)
+
+# libcurl share handle for the loops run in this process; see curl_share()
+_curl_share = None
+_curl_share_lock = threading.Lock()
+
+def curl_share():
+    """
+    Get the libcurl share handle every loop's handle in this process is attached to.
+    
+    The handles share one connection cache, DNS cache and TLS session cache,
+    so a loop started after another one, e.g. by the next /run-curl-loop
+    request, reuses its connection instead of doing a new TLS handshake.
+    pycurl locks the share itself when it is used from several threads.
+    
+    Returns:
+        The pycurl.CurlShare.
+    """
+    global _curl_share
+    with _curl_share_lock:
+        if _curl_share is None:
+            share = pycurl.CurlShare()
+            share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+            share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+            share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)
+            _curl_share = share
+        return _curl_share
+
+def _reset_curl_share_after_fork():
+    """Give a forked child its own share, since connections can't be shared across processes."""
+    global _curl_share, _curl_share_lock
+    _curl_share = None
+    _curl_share_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_curl_share_after_fork)
+
+class _Interrupted(Exception):
+    """Raised by the signal handler to abort a blocking in-process request."""
+
+def _curl_config_quote(value: str) -> str:
+    """Quote a value for a curl config file."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
 class CurlLooper:
     """A class to execute a curl command in a loop with configurable parameters."""
     
@@ -26,7 +420,10 @@ class CurlLooper:
                  max_iterations: Optional[int] = None,
                  timeout: Optional[float] = None,
                  success_only: bool = False,
-                 verbose: bool = False):
+                 verbose: bool = False,
+                 concurrency: int = 1,
+                 use_curl: bool = False,
+                 handle_signals: bool = True):
         """
         Initialize the CurlLooper with the specified parameters.
         
@@ -37,26 +434,87 @@ class CurlLooper:
             timeout: Timeout for each curl command in seconds, or None for no timeout.
             success_only: If True, only log successful requests.
             verbose: If True, display detailed output including response body.
+            concurrency: Maximum number of requests in flight; above 1 the loop runs on asyncio.
+            use_curl: If True, always run the curl binary instead of the in-process HTTP client.
+            handle_signals: If True, stop the loop on SIGINT and SIGTERM. Loops run
+                inside a server leave the server's own handlers in place.
         """
         self.curl_command = curl_command
+        self._cmd_str = ' '.join(curl_command)
         self.interval = interval
         self.max_iterations = max_iterations
         self.timeout = timeout
         self.success_only = success_only
         self.verbose = verbose
+        self.concurrency = max(1, concurrency)
+        self.handle_signals = handle_signals
         self.iteration_count = 0
         self.success_count = 0
         self.failure_count = 0
         self.running = True
+        # Set on shutdown so waits between iterations end immediately
+        self._stop_event = threading.Event()
+        # The curl process currently running, so shutdown can terminate it
+        self._process = None
+        # The signal that stopped the loop, logged once the loop has stopped
+        self._stop_signal = None
+        # Set while a blocking in-process request can be aborted by a signal
+        self._interruptible = False
+        # Spawning by absolute path without closing fds lets subprocess use
+        # posix_spawn instead of fork + exec
+        self._executable = resolve_executable(curl_command[0])
+        
+        # Reuse one keep-alive connection across iterations when the command
+        # can be reproduced in-process, instead of forking curl every time
+        self._request = parse_curl_args(curl_command[1:])
+        self._headers = request_headers(self._request) if self._request is not None else []
+        self._client = None
+        self._curl = None
+        self._curl_body = []
+        # Whether requests are sent with httpx. Concurrent loops open their
+        # own AsyncClient in run_async, so only one-at-a-time loops get
+        # the sync client here.
+        self._use_httpx = False
+        if self._request is not None and not use_curl:
+            # curl's own --max-time takes precedence over the loop timeout
+            self._request["timeout"] = self._request["timeout"] or timeout
+        if self._request is not None and pycurl is not None and not use_curl and self.concurrency == 1:
+            # libcurl behaves exactly like the curl binary, minus the process
+            self._curl = self._create_curl_handle()
+        elif self._request is not None and httpx is not None and not use_curl:
+            self._use_httpx = True
+        if self._use_httpx and self.concurrency == 1:
+            self._client = httpx.Client(
+                http2=self._request["http2"],
+                limits=httpx.Limits(max_keepalive_connections=1, keepalive_expiry=60),
+                timeout=client_timeout(self._request),
+                follow_redirects=self._request["follow_redirects"],
+                verify=self._request["verify"]
+            )
+            use_curl_default_headers(self._client, self._request)
         
         # Set up signal handling for graceful termination
-        signal.signal(signal.SIGINT, self._handle_signal)
-        signal.signal(signal.SIGTERM, self._handle_signal)
+        if handle_signals:
+            signal.signal(signal.SIGINT, self._handle_signal)
+            signal.signal(signal.SIGTERM, self._handle_signal)
         
     def _handle_signal(self, signum, frame):
-        """Handle termination signals by setting running flag to False."""
-        logger.info(f"Received signal {signum}, stopping after current iteration...")
+        """
+        Handle termination signals by stopping the loop and any running request.
+        
+        Nothing is logged here, since logging from a signal handler can re-enter
+        the log handler; the loop reports the signal once it has stopped.
+        """
+        self._stop_signal = signum
         self.running = False
+        self._stop_event.set()
+        
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+        if self._interruptible:
+            self._interruptible = False
+            raise _Interrupted(f"Interrupted by signal {signum}")
         
     def execute_curl(self) -> Union[subprocess.CompletedProcess, subprocess.CalledProcessError]:
         """
@@ -65,19 +523,37 @@ class CurlLooper:
         Returns:
             The completed process or called process error.
         """
+        if self._curl is not None:
+            return self._execute_pycurl()
+        if self._client is not None:
+            return self._execute_request()
+        
         try:
-            # Execute the curl command
-            process = subprocess.run(
+            # Execute the curl command. The response body is only ever logged
+            # in verbose mode, so don't read and decode it otherwise.
+            process = subprocess.Popen(
                 self.curl_command,
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=self.timeout
+                executable=self._executable,
+                close_fds=False,
+                stdout=subprocess.PIPE if self.verbose else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True
             )
-            return process
-        except subprocess.CalledProcessError as e:
-            return e
+        except Exception as e:
+            logger.error(f"Error executing curl command: {str(e)}")
+            return subprocess.CompletedProcess(
+                args=self.curl_command,
+                returncode=-1,
+                stdout="",
+                stderr=str(e)
+            )
+        
+        self._process = process
+        try:
+            stdout, stderr = process.communicate(timeout=self.timeout)
         except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
             logger.error(f"Curl command timed out after {self.timeout} seconds")
             return subprocess.CompletedProcess(
                 args=self.curl_command,
@@ -85,6 +561,171 @@ class CurlLooper:
                 stdout="",
                 stderr=f"Timed out after {self.timeout} seconds"
             )
+        finally:
+            self._process = None
+        
+        if process.returncode != 0:
+            return subprocess.CalledProcessError(
+                process.returncode,
+                self.curl_command,
+                output=stdout,
+                stderr=stderr
+            )
+        return subprocess.CompletedProcess(
+            args=self.curl_command,
+            returncode=0,
+            stdout=stdout,
+            stderr=stderr
+        )
+            
+    def _create_curl_handle(self):
+        """
+        Build a reusable libcurl handle for the parsed request.
+        
+        Returns:
+            The configured pycurl.Curl handle.
+        """
+        request = self._request
+        handle = pycurl.Curl()
+        handle.setopt(pycurl.SHARE, curl_share())
+        handle.setopt(pycurl.URL, request["url"])
+        handle.setopt(pycurl.USERAGENT, curl_user_agent())
+        handle.setopt(pycurl.HTTPHEADER, [
+            f"{name}:" if value is None else f"{name};" if not value else f"{name}: {value}"
+            for name, value in request["headers"]
+        ])
+        if request["content"] is not None:
+            handle.setopt(pycurl.POSTFIELDS, request["content"])
+        if request["method"] != ("POST" if request["content"] is not None else "GET"):
+            handle.setopt(pycurl.CUSTOMREQUEST, request["method"])
+        if request["follow_redirects"]:
+            handle.setopt(pycurl.FOLLOWLOCATION, 1)
+        if not request["verify"]:
+            handle.setopt(pycurl.SSL_VERIFYPEER, 0)
+            handle.setopt(pycurl.SSL_VERIFYHOST, 0)
+        if request["http_version"] == "1.1":
+            handle.setopt(pycurl.HTTP_VERSION, pycurl.CURL_HTTP_VERSION_1_1)
+        elif request["http_version"] == "2":
+            handle.setopt(pycurl.HTTP_VERSION, pycurl.CURL_HTTP_VERSION_2_0)
+        if request["compressed"]:
+            handle.setopt(pycurl.ACCEPT_ENCODING, "")
+        if request["auth"] is not None:
+            handle.setopt(pycurl.USERPWD, ":".join(request["auth"]))
+        if request["timeout"]:
+            handle.setopt(pycurl.TIMEOUT_MS, int(request["timeout"] * 1000))
+        handle.setopt(pycurl.NOSIGNAL, 1)
+        # libcurl calls back at least once a second, which lets Python run the
+        # signal handler mid-transfer and the transfer be aborted on shutdown
+        handle.setopt(pycurl.NOPROGRESS, 0)
+        handle.setopt(pycurl.XFERINFOFUNCTION, self._curl_progress)
+        # Keep the body only when it will be logged; len() just reports it consumed
+        handle.setopt(pycurl.WRITEFUNCTION, self._curl_body.append if self.verbose else len)
+        return handle
+    
+    def _curl_progress(self, download_total, downloaded, upload_total, uploaded) -> int:
+        """Abort the libcurl transfer once the loop has been asked to stop."""
+        return 1 if self._stop_event.is_set() else 0
+    
+    def _execute_pycurl(self) -> subprocess.CompletedProcess:
+        """
+        Execute the request with the persistent libcurl handle.
+        
+        Returns:
+            A completed process mirroring the exit code and output curl would produce.
+        """
+        self._curl_body.clear()
+        try:
+            self._curl.perform()
+        except pycurl.error as e:
+            code, message = e.args
+            return subprocess.CompletedProcess(
+                args=self.curl_command,
+                returncode=code,
+                stdout="",
+                stderr=f"curl: ({code}) {message}"
+            )
+        
+        stdout = b"".join(self._curl_body).decode(errors="replace")
+        status = self._curl.getinfo(pycurl.RESPONSE_CODE)
+        if self._request["fail"] and status >= 400:
+            return subprocess.CompletedProcess(
+                args=self.curl_command,
+                returncode=22,
+                stdout=stdout,
+                stderr=f"The requested URL returned error: {status}"
+            )
+        return subprocess.CompletedProcess(
+            args=self.curl_command,
+            returncode=0,
+            stdout=stdout,
+            stderr=""
+        )
+    
+    def _execute_request(self) -> subprocess.CompletedProcess:
+        """
+        Execute the request with the persistent HTTP client.
+        
+        Returns:
+            A completed process mirroring the exit code and output curl would produce.
+        """
+        request = self._request
+        try:
+            # Let a signal abort the request instead of waiting for it to finish
+            self._interruptible = True
+            response = self._client.request(
+                request["method"],
+                request["url"],
+                headers=self._headers,
+                content=request["content"],
+                auth=request["auth"]
+            )
+        except _Interrupted:
+            # Not a failed request: the loop is stopping, and run() drops it
+            raise
+        except Exception as e:
+            return self._request_error(e)
+        finally:
+            self._interruptible = False
+        return self._response_result(response)
+    
+    async def _execute_request_async(self, client) -> subprocess.CompletedProcess:
+        """
+        Execute the request with the shared asynchronous HTTP client.
+        
+        Args:
+            client: The httpx.AsyncClient to send the request with.
+        
+        Returns:
+            A completed process mirroring the exit code and output curl would produce.
+        """
+        request = self._request
+        try:
+            response = await client.request(
+                request["method"],
+                request["url"],
+                headers=self._headers,
+                content=request["content"],
+                auth=request["auth"]
+            )
+        except Exception as e:
+            return self._request_error(e)
+        return self._response_result(response)
+    
+    async def _execute_curl_async(self) -> subprocess.CompletedProcess:
+        """
+        Execute the curl command without blocking the event loop.
+        
+        Returns:
+            The completed process.
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self.curl_command,
+                executable=self._executable,
+                close_fds=False,
+                stdout=asyncio.subprocess.PIPE if self.verbose else asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
         except Exception as e:
             logger.error(f"Error executing curl command: {str(e)}")
             return subprocess.CompletedProcess(
@@ -93,76 +734,631 @@ class CurlLooper:
                 stdout="",
                 stderr=str(e)
             )
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.error(f"Curl command timed out after {self.timeout} seconds")
+            return subprocess.CompletedProcess(
+                args=self.curl_command,
+                returncode=-1,
+                stdout="",
+                stderr=f"Timed out after {self.timeout} seconds"
+            )
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        
+        return subprocess.CompletedProcess(
+            args=self.curl_command,
+            returncode=process.returncode,
+            stdout=stdout.decode(errors="replace") if stdout else "",
+            stderr=stderr.decode(errors="replace")
+        )
+    
+    def _request_error(self, error: Exception) -> subprocess.CompletedProcess:
+        """
+        Log a failed in-process request and wrap it like a failed curl run.
+        
+        Args:
+            error: The exception raised by the HTTP client.
+        
+        Returns:
+            A completed process with a non-zero return code.
+        """
+        if isinstance(error, httpx.TimeoutException):
+            logger.error(f"Request timed out after {self._request['timeout']} seconds")
+            stderr = f"Timed out after {self._request['timeout']} seconds"
+        else:
+            logger.error(f"Error executing request: {str(error)}")
+            stderr = str(error)
+        
+        return subprocess.CompletedProcess(
+            args=self.curl_command,
+            returncode=-1,
+            stdout="",
+            stderr=stderr
+        )
+    
+    def _response_result(self, response) -> subprocess.CompletedProcess:
+        """
+        Wrap an HTTP response like the curl run that would have produced it.
+        
+        Args:
+            response: The httpx.Response received.
+        
+        Returns:
+            A completed process with curl's return code for the response.
+        """
+        # Like curl, only treat HTTP errors as failures when --fail was given
+        if self._request["fail"] and response.status_code >= 400:
+            return subprocess.CompletedProcess(
+                args=self.curl_command,
+                returncode=22,
+                stdout=response.text,
+                stderr=f"The requested URL returned error: {response.status_code}"
+            )
+        
+        return subprocess.CompletedProcess(
+            args=self.curl_command,
+            returncode=0,
+            stdout=response.text,
+            stderr=""
+        )
             
-    def log_result(self, result):
+    def log_result(self, result, iteration: Optional[int] = None):
         """
         Log the result of a curl execution.
         
         Args:
             result: The subprocess.CompletedProcess or subprocess.CalledProcessError.
+            iteration: The iteration the result belongs to, defaulting to the current one.
         """
+        if iteration is None:
+            iteration = self.iteration_count
+        
         if result.returncode == 0:
             self.success_count += 1
             if not self.success_only or self.verbose:
-                logger.info(f"Iteration {self.iteration_count}: Success")
-                if self.verbose:
-                    logger.info(f"Response: {result.stdout.strip()}")
+                self._log_success(result, iteration)
         else:
             self.failure_count += 1
-            logger.error(f"Iteration {self.iteration_count}: Failed with code {result.returncode}")
-            logger.error(f"Error: {result.stderr.strip()}")
-            if self.verbose and hasattr(result, 'stdout') and result.stdout:
-                logger.info(f"Response: {result.stdout.strip()}")
+            self._log_failure(result, iteration)
+    
+    def _log_success(self, result, iteration: int):
+        """
+        Log a successful curl execution.
+        
+        Args:
+            result: The subprocess.CompletedProcess.
+            iteration: The iteration the result belongs to.
+        """
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Iteration %d: Success", iteration)
+            if self.verbose:
+                logger.info("Response: %s", result.stdout.strip())
+    
+    def _log_failure(self, result, iteration: int):
+        """
+        Log a failed curl execution.
+        
+        Args:
+            result: The subprocess.CompletedProcess or subprocess.CalledProcessError.
+            iteration: The iteration the result belongs to.
+        """
+        logger.error("Iteration %d: Failed with code %d", iteration, result.returncode)
+        logger.error("Error: %s", result.stderr.strip())
+        if self.verbose and hasattr(result, 'stdout') and result.stdout and logger.isEnabledFor(logging.INFO):
+            logger.info("Response: %s", result.stdout.strip())
                 
-    def run(self):
-        """Run the curl command in a loop according to the configuration."""
-        logger.info(f"Starting curl loop with command: {' '.join(self.curl_command)}")
+    def _log_start(self):
+        """Log the loop configuration before the first iteration."""
+        logger.info(f"Starting curl loop with command: {self._cmd_str}")
+        if self._curl is not None:
+            logger.info("Using libcurl in-process with a persistent connection")
+        elif self._use_httpx:
+            logger.info("Using in-process HTTP client with a persistent connection")
+        elif self._use_curl_batches():
+            logger.info(f"Running up to {CURL_BATCH_SIZE} iterations per curl process")
         logger.info(f"Interval: {self.interval} seconds")
+        if self.concurrency > 1:
+            logger.info(f"Concurrency: {self.concurrency} requests in flight")
         if self.max_iterations:
             logger.info(f"Maximum iterations: {self.max_iterations}")
         else:
             logger.info("Running indefinitely. Press Ctrl+C to stop.")
+    
+    def _log_summary(self, duration: float):
+        """
+        Log the summary statistics of the run.
+        
+        Args:
+            duration: Total execution time in seconds.
+        """
+        logger.info("\nExecution Summary:")
+        logger.info(f"Total iterations: {self.iteration_count}")
+        logger.info(f"Successful requests: {self.success_count}")
+        logger.info(f"Failed requests: {self.failure_count}")
+        logger.info(f"Total execution time: {duration:.2f} seconds")
+        if self.iteration_count > 0:
+            average = duration / self.iteration_count
+            success_rate = self.success_count * 100 / self.iteration_count
+            logger.info(f"Average request time: {average:.2f} seconds")
+            logger.info(f"Success rate: {success_rate:.2f}%")
+                
+    def _use_curl_batches(self) -> bool:
+        """
+        Decide whether iterations can be handed to a long-lived curl process.
+        
+        Returns:
+            True when curl is used for one request at a time, the target URL
+            is known and curl can pace transfers at the configured interval itself.
+        """
+        if self._curl is not None or self._use_httpx or self._request is None:
+            return False
+        if self.concurrency > 1:
+            return False
+        # curl's --rate counts transfers per day, so longer intervals can't be expressed
+        if self.interval > 86400:
+            return False
+        return curl_supports_rate()
+    
+    def _run_curl_batch(self, count: int):
+        """
+        Run `count` iterations in a single curl process.
+        
+        The extra transfers are fed to curl as a config file on stdin, so all
+        of them share one process and its open connections. curl spaces them
+        by the interval with --rate and reports each one through --write-out.
         
-        start_time = datetime.now()
+        curl's stdout and stderr share one pipe, so each response body (flushed
+        by --no-buffer) is read back just ahead of the result of its transfer.
         
+        Args:
+            count: Number of iterations to run in this process.
+        """
+        command = self.curl_command + ["--silent", "--no-buffer", "--write-out", CURL_RESULT_FORMAT]
+        if self.interval > 0:
+            command += ["--rate", f"{max(1, round(86400 / self.interval))}/d"]
+        if self.timeout and self._request["timeout"] is None:
+            command += ["--max-time", str(self.timeout)]
+        # The URL on the command line covers the first transfer
+        command += ["--config", "-"]
+        config = f"url = {_curl_config_quote(self._request['url'])}\n" * (count - 1)
+        
+        # When the next transfer is due to start, to tell whether one was cut
+        # short if the loop is stopped before curl reports it
+        next_start = time.monotonic()
+        process = subprocess.Popen(
+            command,
+            executable=self._executable,
+            close_fds=False,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT
+        )
+        self._process = process
+        process.stdin.write(config.encode())
+        process.stdin.close()
+        
+        reported = 0
         try:
-            while self.running:
-                self.iteration_count += 1
+            body = []
+            for line in process.stdout:
+                if not line.startswith(CURL_RESULT_MARKER):
+                    body.append(line)
+                    continue
+                
+                # Drop the newline --write-out put in front of the marker
+                stdout = b"".join(body)[:-1].decode(errors="replace")
+                body = []
+                exit_code, duration, error = line[len(CURL_RESULT_MARKER):].decode(errors="replace").split(" ", 2)
                 
+                # --rate spaces transfer starts by the interval
+                now = time.monotonic()
+                next_start = max(now, now - float(duration) + self.interval)
+                
+                reported += 1
+                self.iteration_count += 1
+                self.log_result(subprocess.CompletedProcess(
+                    args=command,
+                    returncode=int(exit_code),
+                    stdout=stdout,
+                    stderr=error.strip()
+                ))
+                if not self.running:
+                    break
+        finally:
+            self._process = None
+            if process.poll() is None:
+                process.terminate()
+            process.wait()
+        
+        # A transfer that was under way when curl was stopped may already have
+        # reached the server, so count it rather than dropping it silently
+        if not self.running and reported < count and time.monotonic() >= next_start:
+            self.iteration_count += 1
+            self.log_result(subprocess.CompletedProcess(
+                args=command,
+                returncode=-1,
+                stdout="",
+                stderr="Stopped before curl reported the result"
+            ))
+    
+    def _run_curl_batches(self):
+        """Run the loop as a series of long-lived curl processes."""
+        while self.running:
+            remaining = CURL_BATCH_SIZE
+            if self.max_iterations:
+                remaining = min(remaining, self.max_iterations - self.iteration_count)
+                if remaining <= 0:
+                    logger.info(f"Reached maximum iterations ({self.max_iterations}), stopping.")
+                    break
+            
+            self._run_curl_batch(remaining)
+            
+            # curl paces transfers within a batch; pace the gap between batches here
+            if self.running and (self.max_iterations is None or self.iteration_count < self.max_iterations):
+                if self._stop_event.wait(self.interval):
+                    break
+    
+    def run(self):
+        """Run the curl command in a loop according to the configuration."""
+        if self.concurrency > 1:
+            # Run on uvloop when it is installed
+            loop_factory = uvloop.new_event_loop if uvloop is not None else None
+            with asyncio.Runner(loop_factory=loop_factory) as runner:
+                runner.run(self.run_async())
+            return
+        
+        self._log_start()
+        
+        start_ns = time.monotonic_ns()
+        
+        try:
+            if self._use_curl_batches():
+                self._run_curl_batches()
+                return
+            
+            # Schedule iterations against fixed deadlines so request time doesn't
+            # stretch the period and drift doesn't accumulate across iterations
+            max_iterations = self.max_iterations
+            interval = self.interval
+            execute_curl = self.execute_curl
+            log_success = self._log_success
+            log_failure = self._log_failure
+            # Successes aren't logged at all in success-only mode
+            quiet_success = self.success_only and not self.verbose
+            stop = self._stop_event.wait
+            monotonic = time.monotonic
+            t0 = monotonic()
+            
+            if max_iterations:
+                for i in range(1, max_iterations + 1):
+                    self.iteration_count = i
+                    result = execute_curl()
+                    if result.returncode == 0:
+                        self.success_count += 1
+                        if not quiet_success:
+                            log_success(result, i)
+                    else:
+                        self.failure_count += 1
+                        log_failure(result, i)
+                    if i == max_iterations:
+                        logger.info(f"Reached maximum iterations ({max_iterations}), stopping.")
+                        break
+                    # Wait until the next iteration is due. After a stall, run
+                    # the next one now instead of catching up on missed slots.
+                    delay = t0 + i * interval - monotonic()
+                    if delay < 0:
+                        t0 -= delay
+                        delay = 0.0
+                    if stop(delay):
+                        break
+            else:
+                i = 0
+                while not stop(0):
+                    i += 1
+                    self.iteration_count = i
+                    result = execute_curl()
+                    if result.returncode == 0:
+                        self.success_count += 1
+                        if not quiet_success:
+                            log_success(result, i)
+                    else:
+                        self.failure_count += 1
+                        log_failure(result, i)
+                    # Wait until the next iteration is due. After a stall, run
+                    # the next one now instead of catching up on missed slots.
+                    delay = t0 + i * interval - monotonic()
+                    if delay < 0:
+                        t0 -= delay
+                        delay = 0.0
+                    if stop(delay):
+                        break
+        
+        except _Interrupted:
+            # The request cut short by the signal never completed, so it is
+            # neither a success nor a failure
+            self.iteration_count -= 1
+                    
+        finally:
+            if self._curl is not None:
+                self._curl.close()
+            if self._client is not None:
+                self._client.close()
+            
+            if self._stop_signal is not None:
+                logger.info(f"Received signal {self._stop_signal}, stopped.")
+            
+            # Print summary statistics
+            self._log_summary((time.monotonic_ns() - start_ns) / 1e9)
+            _log_handler.flush()
+    
+    async def _run_iteration_async(self, client, iteration: int, semaphore: asyncio.Semaphore):
+        """
+        Execute one iteration on the event loop and release its concurrency slot.
+        
+        Args:
+            client: The shared httpx.AsyncClient, or None to spawn curl.
+            iteration: The iteration number being executed.
+            semaphore: The semaphore bounding the number of requests in flight.
+        """
+        try:
+            if client is not None:
+                result = await self._execute_request_async(client)
+            else:
+                result = await self._execute_curl_async()
+            self.log_result(result, iteration)
+        finally:
+            semaphore.release()
+    
+    async def run_async(self):
+        """
+        Run the loop on asyncio so request latency overlaps the interval wait.
+        
+        A new iteration starts every interval regardless of whether earlier
+        requests have completed, with at most `concurrency` requests in flight.
+        """
+        self._log_start()
+        
+        loop = asyncio.get_running_loop()
+        stop_event = asyncio.Event()
+        
+        def handle_signal(signum):
+            logger.info(f"Received signal {signum}, cancelling in-flight requests...")
+            self.running = False
+            stop_event.set()
+        
+        # Wake the loop immediately on Ctrl+C instead of after the current wait
+        signals = []
+        for signum in (signal.SIGINT, signal.SIGTERM) if self.handle_signals else ():
+            try:
+                loop.add_signal_handler(signum, handle_signal, signum)
+                signals.append(signum)
+            except (NotImplementedError, RuntimeError):
+                # Not supported on this platform or outside the main thread
+                pass
+        
+        client = None
+        if self._use_httpx:
+            client = httpx.AsyncClient(
+                http2=self._request["http2"],
+                limits=httpx.Limits(max_keepalive_connections=self.concurrency, keepalive_expiry=60),
+                timeout=client_timeout(self._request),
+                follow_redirects=self._request["follow_redirects"],
+                verify=self._request["verify"]
+            )
+            use_curl_default_headers(client, self._request)
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        in_flight = set()
+        start_ns = time.monotonic_ns()
+        
+        try:
+            while self.running:
                 # Check if we've reached the maximum number of iterations
-                if self.max_iterations and self.iteration_count > self.max_iterations:
+                if self.max_iterations and self.iteration_count >= self.max_iterations:
                     logger.info(f"Reached maximum iterations ({self.max_iterations}), stopping.")
                     break
                 
-                # Execute the curl command and log the result
-                result = self.execute_curl()
-                self.log_result(result)
+                # Wait for a free slot, but give up as soon as a stop is requested
+                acquire = asyncio.ensure_future(semaphore.acquire())
+                stop = asyncio.ensure_future(stop_event.wait())
+                await asyncio.wait((acquire, stop), return_when=asyncio.FIRST_COMPLETED)
+                stop.cancel()
+                if not acquire.done():
+                    acquire.cancel()
+                    break
+                if not self.running:
+                    semaphore.release()
+                    break
+                
+                self.iteration_count += 1
+                task = asyncio.create_task(
+                    self._run_iteration_async(client, self.iteration_count, semaphore)
+                )
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                
+                # Wait for the interval, waking early if a stop was requested
+                if self.max_iterations is None or self.iteration_count < self.max_iterations:
+                    try:
+                        await asyncio.wait_for(stop_event.wait(), self.interval)
+                    except asyncio.TimeoutError:
+                        pass
+            
+            if stop_event.is_set():
+                for task in in_flight:
+                    task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
                 
-                # Wait for the specified interval before the next iteration
-                if self.running and (self.max_iterations is None or self.iteration_count < self.max_iterations):
-                    time.sleep(self.interval)
-                    
         finally:
-            # Print summary statistics
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            if client is not None:
+                await client.aclose()
             
-            logger.info("\nExecution Summary:")
-            logger.info(f"Total iterations: {self.iteration_count}")
-            logger.info(f"Successful requests: {self.success_count}")
-            logger.info(f"Failed requests: {self.failure_count}")
-            logger.info(f"Total execution time: {duration:.2f} seconds")
-            if self.iteration_count > 0:
-                logger.info(f"Average request time: {duration / self.iteration_count:.2f} seconds")
-                logger.info(f"Success rate: {self.success_count / self.iteration_count * 100:.2f}%")
+            for signum in signals:
+                loop.remove_signal_handler(signum)
+                signal.signal(signum, self._handle_signal)
+            
+            # Print summary statistics
+            self._log_summary((time.monotonic_ns() - start_ns) / 1e9)
+            _log_handler.flush()
+
+class _ThreadLog(logging.Handler):
+    """A logging handler passing the lines logged by the thread that created it to a callback."""
+    
+    def __init__(self, callback):
+        super().__init__()
+        self._callback = callback
+        self._thread = threading.get_ident()
+        self.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+    
+    def emit(self, record):
+        # Loops running at the same time in other threads keep their own lines
+        if record.thread == self._thread:
+            self._callback(self.format(record))
+
+def run(curl_args: List[str],
+        interval: float = 1.0,
+        iterations: Optional[int] = None,
+        timeout: Optional[float] = None,
+        success_only: bool = False,
+        verbose: bool = False,
+        use_curl: bool = False,
+        max_lines: Optional[int] = None) -> subprocess.CompletedProcess:
+    """
+    Run a loop in-process and return its log output and outcome.
+    
+    This is the library counterpart of running the script: the loop is the
+    same, but it runs in the calling thread and leaves signal handling to
+    the caller.
+    
+    Args:
+        curl_args: The curl arguments, without the leading 'curl'.
+        interval: Time to wait between requests in seconds.
+        iterations: Maximum number of iterations, or None for infinite.
+        timeout: Timeout for each request in seconds, or None for no timeout.
+        success_only: If True, only log successful requests.
+        verbose: If True, include the response bodies in the output.
+        use_curl: If True, always run the curl binary instead of the in-process HTTP client.
+        max_lines: Keep only this many of the last output lines, or None for all.
+    
+    Returns:
+        A subprocess.CompletedProcess with the loop's log lines, as the script
+        would print them, as stdout and a returncode of 1 if any of its
+        requests failed.
+    """
+    lines = collections.deque(maxlen=max_lines)
+    handler = _ThreadLog(lines.append)
+    logger.addHandler(handler)
+    try:
+        looper = CurlLooper(
+            curl_command=["curl"] + curl_args,
+            interval=interval,
+            max_iterations=iterations,
+            timeout=timeout,
+            success_only=success_only,
+            verbose=verbose,
+            use_curl=use_curl,
+            handle_signals=False
+        )
+        looper.run()
+    finally:
+        logger.removeHandler(handler)
+    return subprocess.CompletedProcess(
+        args=looper.curl_command,
+        returncode=1 if looper.failure_count else 0,
+        stdout="".join(f"{line}\n" for line in lines),
+        stderr=""
+    )
+
+# Loop options understood by the fast argument parser, with their value type
+# (None for flags) and destination
+_FAST_OPTIONS = {
+    "-i": ("interval", float), "--interval": ("interval", float),
+    "-n": ("iterations", int), "--iterations": ("iterations", int),
+    "-t": ("timeout", float), "--timeout": ("timeout", float),
+    "-c": ("concurrency", int), "--concurrency": ("concurrency", int),
+    "--use-curl": ("use_curl", None),
+    "-s": ("success_only", None), "--success-only": ("success_only", None),
+    "-v": ("verbose", None), "--verbose": ("verbose", None),
+    "--log-level": ("log_level", str),
+}
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+def _parse_arguments_fast(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Parse the common command lines without building an argparse parser.
+    
+    Args:
+        argv: The command-line arguments, without the program name.
+    
+    Returns:
+        The parsed arguments, or None if the command line needs argparse
+        (help, unknown or combined options, invalid values).
+    """
+    args = SimpleNamespace(
+        curl_command=[],
+        interval=1.0,
+        iterations=None,
+        timeout=None,
+        concurrency=1,
+        use_curl=False,
+        success_only=False,
+        verbose=False,
+        log_level="INFO"
+    )
+    
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        i += 1
+        if arg == "--":
+            args.curl_command.extend(argv[i:])
+            break
+        if not arg.startswith("-") or arg == "-":
+            args.curl_command.append(arg)
+            continue
+        if arg not in _FAST_OPTIONS:
+            return None
+        
+        dest, convert = _FAST_OPTIONS[arg]
+        if convert is None:
+            setattr(args, dest, True)
+            continue
+        if i == len(argv):
+            return None
+        try:
+            setattr(args, dest, convert(argv[i]))
+        except ValueError:
+            return None
+        i += 1
+    
+    if not args.curl_command or args.log_level not in _LOG_LEVELS:
+        return None
+    return args
 
 def parse_arguments():
     """
     Parse command-line arguments.
     
+    Plain command lines are handled by a small hand-written parser; argparse
+    is only imported for help, usage errors and anything else unusual.
+    
     Returns:
         The parsed arguments.
     """
+    args = _parse_arguments_fast(sys.argv[1:])
+    if args is not None:
+        return args
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Execute a curl command in a loop with configurable parameters.",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
@@ -193,6 +1389,19 @@ def parse_arguments():
         help="Timeout for each curl command in seconds."
     )
     
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=1,
+        help="Maximum number of requests in flight at once. Values above 1 start a new request every interval without waiting for the previous one."
+    )
+    
+    parser.add_argument(
+        "--use-curl",
+        action="store_true",
+        help="Always run the curl binary instead of the in-process HTTP client."
+    )
+    
     parser.add_argument(
         "-s", "--success-only",
         action="store_true",
@@ -207,7 +1416,7 @@ def parse_arguments():
     
     parser.add_argument(
         "--log-level",
-        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        choices=_LOG_LEVELS,
         default="INFO",
         help="Set the logging level."
     )
@@ -231,7 +1440,9 @@ def main():
         max_iterations=args.iterations,
         timeout=args.timeout,
         success_only=args.success_only,
-        verbose=args.verbose
+        verbose=args.verbose,
+        concurrency=args.concurrency,
+        use_curl=args.use_curl
     )
     
     looper.run()
@@ -0,0 +1,29 @@
+"""
+Gunicorn settings, read automatically when gunicorn is started from this directory.
+
+Every route spends its time waiting on I/O (mostly requests to ntfy.sh), so
+each worker runs gevent and serves up to `worker_connections` requests at
+once instead of one at a time. A loop page streaming its output for the
+whole loop only holds a greenlet, not a worker. This is what an ASGI server
+with async views would give, without asyncio: an event loop in one greenlet
+is seen as running by every other greenlet in the thread, so the views stay
+synchronous and gevent makes their I/O cooperative.
+
+The deployment starts gunicorn with --preload, so the master imports main.py
+once (building the precompressed pages) and the workers share it
+copy-on-write. The development workflow leaves it off, because preloading
+stops --reload from picking up code changes.
+"""
+
+import multiprocessing
+
+# The gevent worker only patches the standard library once it has forked. With
+# --preload the app is imported by the master before that, so patch here
+# first; otherwise the queue, locks and client main.py creates at import
+# would block the whole worker instead of yielding to other greenlets.
+from gevent import monkey
+monkey.patch_all()
+
+worker_class = "gevent"
+worker_connections = 1000
+workers = 2 * multiprocessing.cpu_count()
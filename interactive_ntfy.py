@@ -6,7 +6,7 @@ This script prompts the user for a title, message, and topic, then sends a notif
 
 import sys
 import argparse
-from ntfy_loop import NtfyLooper, send_ntfy_message
+from ntfy_loop import NtfyLooper, run_event_loop, send_ntfy_message
 
 def get_user_input(prompt, default=None):
     """Get input from user with an optional default value."""
@@ -83,7 +83,7 @@ def main():
             )
             
             print("\nPress Ctrl+C to stop early\n")
-            looper.run()
+            run_event_loop(looper.run_async())
             
         except KeyboardInterrupt:
             print("\nStopped by user")
@@ -109,6 +109,9 @@ def main():
                 tags=args.tags,
                 priority=args.priority
             )
+            if result.returncode != 0:
+                print(f"Error sending message: {result.stderr.strip()}")
+                sys.exit(1)
             print(f"Message sent successfully to ntfy.sh/{topic}")
             
         except Exception as e:
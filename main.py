@@ -5,378 +5,58 @@ Dual-purpose main module:
 2. Can be run directly to launch the interactive NTFY sender
 """
 
+import gzip
+import hashlib
 import os
+import queue
+import re
+import string
 import sys
-import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
 try:
-    from flask import Flask, render_template_string, redirect, url_for, request
+    import brotli
 except ImportError:
-    # In case Flask is not available (likely during debugging)
-    Flask = None
-    render_template_string = None
-    redirect = None
-    url_for = None
-    request = None
+    # Pages are only precompressed with gzip without the brotli package
+    brotli = None
 import threading
-import webbrowser
 
-# Create Flask app
-app = Flask(__name__)
+from curl_loop import run as curl_run
+from ntfy_loop import run as ntfy_run, send_ntfy_message, stream as ntfy_stream
 
-# HTML template for the NTFY interface
-HTML_TEMPLATE = """
+# Files served by the app live next to this module; resolve the path once at import
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Flask is imported and the app created on first use of `app` (see
+# __getattr__ below), so running the interactive sender doesn't load Flask
+_app = None
+Response = None
+abort = None
+request = None
+
+# Directory of the pages' scripts and stylesheets
+_STATIC_DIR = os.path.join(_HERE, "static")
+
+# The Bootstrap theme every page uses, loaded from Replit's CDN
+BOOTSTRAP_CDN_URL = "https://cdn.replit.com/agent/bootstrap-agent-dark-theme.min.css"
+
+# Shell shared by the pages built at import; each page supplies its title,
+# any tags it adds to <head> and its body
+PAGE_SHELL = string.Template("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>efenow's NTFY.SH Sender</title>
-    <link href="https://cdn.replit.com/agent/bootstrap-agent-dark-theme.min.css" rel="stylesheet">
-    <style>
-        body {
-            padding-top: 2rem;
-            min-height: 100vh;
-            display: flex;
-            flex-direction: column;
-        }
-        .main-content {
-            flex: 1;
-        }
-        .header-box {
-            background-color: #212529;
-            border-radius: 6px;
-            padding: 15px;
-            margin-bottom: 2rem;
-            text-align: center;
-        }
-        .form-container {
-            max-width: 700px;
-            margin: 0 auto;
-        }
-        .card {
-            margin-bottom: 1rem;
-            background-color: #2d3338;
-            border: 1px solid #343a40;
-        }
-        footer {
-            margin-top: 3rem;
-            padding: 2rem 0;
-            background-color: #212529;
-        }
-        /* Make dropdown arrows match text color */
-        .form-select {
-            background-image: url("data:image/svg+xml,%3csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 16 16'%3e%3cpath fill='none' stroke='%23adb5bd' stroke-linecap='round' stroke-linejoin='round' stroke-width='2' d='m2 5 6 6 6-6'/%3e%3c/svg%3e");
-            background-repeat: no-repeat;
-            background-position: right 0.75rem center;
-            background-size: 16px 12px;
-        }
-        
-        /* Make table text color consistent with other text */
-        .table {
-            color: #dee2e6;
-        }
-        
-        /* Make sure table header has consistent color */
-        .table thead th {
-            color: #adb5bd;
-        }
-        
-        /* Forever switch animation styles */
-        .infinite-container {
-            position: relative;
-        }
-        
-        .infinite-input {
-            width: 100%;
-            transition: opacity 0.3s ease-in-out;
-        }
-        
-        .infinite-overlay {
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background: #495057;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            border-radius: 0.375rem;
-            opacity: 0;
-            transform: scale(0.95);
-            transition: all 0.3s ease-in-out;
-            pointer-events: none;
-            border: 1px solid #495057;
-            overflow: hidden;
-            cursor: pointer;
-        }
-        
-        .infinite-overlay.active {
-            opacity: 1;
-            transform: scale(1);
-            z-index: 1;
-            pointer-events: auto; /* Make it clickable when active */
-        }
-        
-        .infinite-symbol {
-            font-size: 2rem;
-            color: #adb5bd;
-            font-weight: bold;
-            display: inline-block;
-            animation: pulse 2s infinite ease-in-out;
-        }
-        
-        @keyframes pulse {
-            0% {
-                transform: scale(1);
-                opacity: 0.8;
-            }
-            50% {
-                transform: scale(1.1);
-                opacity: 1;
-            }
-            100% {
-                transform: scale(1);
-                opacity: 0.8;
-            }
-        }
-    </style>
-    <script>
-        // Store active NTFY loops
-        let ntfyTasks = [];
-        let nextTaskId = 1;
-        
-        // Function to update the task table
-        function updateTaskTable() {
-            const tableBody = document.getElementById('ntfy-tasks-body');
-            const emptyRow = document.querySelector('.empty-row');
-            
-            // Show/hide empty row message
-            if (ntfyTasks.length === 0) {
-                emptyRow.style.display = 'table-row';
-                return;
-            } else {
-                emptyRow.style.display = 'none';
-            }
-            
-            // Clear existing rows except the empty row
-            const rows = tableBody.querySelectorAll('tr:not(.empty-row)');
-            rows.forEach(row => row.remove());
-            
-            // Add task rows
-            ntfyTasks.forEach(task => {
-                const row = document.createElement('tr');
-                row.dataset.taskId = task.id;
-                
-                // Title
-                const titleCell = document.createElement('td');
-                titleCell.textContent = task.title;
-                row.appendChild(titleCell);
-                
-                // Topic
-                const topicCell = document.createElement('td');
-                topicCell.textContent = task.topic;
-                row.appendChild(topicCell);
-                
-                // Priority
-                const priorityCell = document.createElement('td');
-                priorityCell.textContent = task.priority;
-                row.appendChild(priorityCell);
-                
-                // Interval
-                const intervalCell = document.createElement('td');
-                intervalCell.textContent = task.intervalDisplay;
-                row.appendChild(intervalCell);
-                
-                // Time left
-                const timeLeftCell = document.createElement('td');
-                timeLeftCell.textContent = task.isInfinite ? '∞' : calculateTimeLeft(task);
-                timeLeftCell.classList.add('time-left');
-                row.appendChild(timeLeftCell);
-                
-                // Actions
-                const actionsCell = document.createElement('td');
-                const deleteBtn = document.createElement('button');
-                deleteBtn.className = 'btn btn-sm btn-danger';
-                deleteBtn.textContent = 'Stop';
-                deleteBtn.onclick = function() { deleteTask(task.id); };
-                actionsCell.appendChild(deleteBtn);
-                row.appendChild(actionsCell);
-                
-                tableBody.appendChild(row);
-            });
-        }
-        
-        // Function to calculate time left display
-        function calculateTimeLeft(task) {
-            if (!task.nextRunTime) return 'Pending';
-            
-            const now = new Date();
-            const diff = Math.max(0, Math.floor((task.nextRunTime - now) / 1000));
-            
-            if (diff === 0) return 'Now';
-            
-            const minutes = Math.floor(diff / 60);
-            const seconds = diff % 60;
-            
-            if (minutes > 0) {
-                return `${minutes}m ${seconds}s`;
-            } else {
-                return `${seconds}s`;
-            }
-        }
-        
-        // Function to delete a task
-        function deleteTask(taskId) {
-            const index = ntfyTasks.findIndex(task => task.id === taskId);
-            if (index !== -1) {
-                // Cancel the interval timer
-                clearInterval(ntfyTasks[index].timer);
-                // Remove from array
-                ntfyTasks.splice(index, 1);
-                // Update the table
-                updateTaskTable();
-            }
-        }
-        
-        // Function to update time left for all tasks
-        function updateTimers() {
-            const timeLeftCells = document.querySelectorAll('.time-left');
-            ntfyTasks.forEach((task, index) => {
-                if (!task.isInfinite && timeLeftCells[index]) {
-                    timeLeftCells[index].textContent = calculateTimeLeft(task);
-                }
-            });
-        }
-        
-        // Update timers every second
-        setInterval(updateTimers, 1000);
-        
-        // Function to add a task (will be called from the form submission)
-        function addNtfyTask(taskData) {
-            const task = {
-                id: nextTaskId++,
-                title: taskData.title,
-                topic: taskData.topic,
-                message: taskData.message,
-                tags: taskData.tags,
-                priority: taskData.priority,
-                intervalValue: taskData.intervalValue,
-                intervalUnit: taskData.intervalUnit,
-                intervalDisplay: `${taskData.intervalValue} ${taskData.intervalUnit}`,
-                isInfinite: taskData.isInfinite,
-                iterations: taskData.iterations,
-                nextRunTime: new Date(Date.now() + convertToMilliseconds(taskData.intervalValue, taskData.intervalUnit)),
-                timer: null
-            };
-            
-            // Set up the interval timer
-            task.timer = setInterval(() => {
-                // Here would be the actual code to send the notification
-                // For now, we'll just update the next run time
-                task.nextRunTime = new Date(Date.now() + convertToMilliseconds(task.intervalValue, task.intervalUnit));
-                updateTaskTable();
-            }, convertToMilliseconds(task.intervalValue, task.intervalUnit));
-            
-            // Add to tasks array
-            ntfyTasks.push(task);
-            
-            // Update the table
-            updateTaskTable();
-        }
-        
-        // Convert interval to milliseconds based on unit
-        function convertToMilliseconds(value, unit) {
-            switch (unit) {
-                case 'hours': return value * 60 * 60 * 1000;
-                case 'minutes': return value * 60 * 1000;
-                case 'seconds': return value * 1000;
-                default: return value * 1000; // Default to seconds
-            }
-        }
-        
-        // Initialize on page load
-        document.addEventListener('DOMContentLoaded', function() {
-            // Set up form submission to add a task
-            const form = document.querySelector('form[action="/run-ntfy-loop"]');
-            if (form) {
-                form.addEventListener('submit', function(e) {
-                    e.preventDefault();
-                    
-                    const formData = new FormData(form);
-                    const taskData = {
-                        title: formData.get('title'),
-                        topic: formData.get('topic'),
-                        message: formData.get('message'),
-                        tags: formData.get('tags'),
-                        priority: formData.get('priority'),
-                        intervalValue: parseInt(formData.get('interval_value')),
-                        intervalUnit: formData.get('interval_unit'),
-                        isInfinite: formData.get('infinite_loop') === 'on',
-                        iterations: formData.get('iterations_value')
-                    };
-                    
-                    // Add the task
-                    addNtfyTask(taskData);
-                    
-                    // Optional: Reset form or show confirmation
-                    alert('NTFY loop created successfully!');
-                });
-            }
-            
-            // Set up the infinite loop checkbox to disable/enable iterations input
-            const infiniteCheckbox = document.getElementById('infinite-loop');
-            const iterationsInput = document.getElementById('loop-iterations');
-            const infiniteOverlay = document.getElementById('infinite-overlay');
-            const infiniteInputContainer = document.querySelector('.infinite-input');
-            
-            if (infiniteCheckbox && iterationsInput && infiniteOverlay) {
-                // Function to update the UI based on checkbox state
-                function updateInfiniteUI(checked) {
-                    iterationsInput.disabled = checked;
-                    
-                    // Handle the animation
-                    if (checked) {
-                        // When checked, show the infinity animation
-                        iterationsInput.value = '';
-                        
-                        // Fade out the input slightly
-                        infiniteInputContainer.style.opacity = '0.4';
-                        
-                        // Show the overlay with animation
-                        setTimeout(() => {
-                            infiniteOverlay.classList.add('active');
-                        }, 100);
-                    } else {
-                        // When unchecked, hide the infinity animation
-                        iterationsInput.value = '5';
-                        
-                        // Restore input opacity
-                        infiniteInputContainer.style.opacity = '1';
-                        
-                        // Hide the overlay with animation
-                        infiniteOverlay.classList.remove('active');
-                    }
-                }
-                
-                // Event listener for checkbox changes
-                infiniteCheckbox.addEventListener('change', function() {
-                    updateInfiniteUI(this.checked);
-                });
-                
-                // Event listener for clicking on the infinity overlay
-                infiniteOverlay.addEventListener('click', function() {
-                    // Uncheck the checkbox
-                    infiniteCheckbox.checked = false;
-                    
-                    // Update the UI
-                    updateInfiniteUI(false);
-                });
-            }
-        });
-    </script>
-</head>
+    <title>$title</title>
+    <link href="$bootstrap_css" rel="stylesheet">
+$head</head>
 <body data-bs-theme="dark">
+$body</body>
+</html>
+""")
+
+# Body of the NTFY interface
+HTML_TEMPLATE = """
     <div class="container main-content">
         <div class="header-box">
             <h1> efenow's NTFY.sh Message Sender</h1>
@@ -463,7 +143,7 @@ HTML_TEMPLATE = """
                             <div class="infinite-container">
                                 <!-- Normal input for iterations count -->
                                 <div class="input-group infinite-input">
-                                    <input type="number" class="form-control" id="loop-iterations" name="iterations_value" value="5" min="1">
+                                    <input type="number" class="form-control" id="loop-iterations" name="iterations_value" value="5" min="1" max="1000">
                                     <div class="input-group-text">
                                         <div class="form-check form-switch">
                                             <input class="form-check-input" type="checkbox" id="infinite-loop" name="infinite_loop">
@@ -508,6 +188,16 @@ HTML_TEMPLATE = """
                                 </tr>
                             </tbody>
                         </table>
+                        <template id="ntfy-task-row">
+                            <tr>
+                                <td></td>
+                                <td></td>
+                                <td></td>
+                                <td></td>
+                                <td class="time-left"></td>
+                                <td><button type="button" class="btn btn-sm btn-danger">Stop</button></td>
+                            </tr>
+                        </template>
                     </div>
                 </div>
             </div>
@@ -541,162 +231,546 @@ HTML_TEMPLATE = """
             </div>
         </div>
     </footer>
+"""
+
+# Styles and body of the interactive sender's form page
+INTERACTIVE_FORM_STYLE = """
+    <style>
+        body {
+            padding-top: 2rem;
+            min-height: 100vh;
+            display: flex;
+            flex-direction: column;
+        }
+        .main-content {
+            flex: 1;
+        }
+        .header-box {
+            background-color: #212529;
+            border-radius: 6px;
+            padding: 15px;
+            margin-bottom: 2rem;
+            text-align: center;
+        }
+        .form-container {
+            max-width: 700px;
+            margin: 0 auto;
+        }
+        .card {
+            margin-bottom: 1rem;
+            background-color: #2d3338;
+            border: 1px solid #343a40;
+        }
+        footer {
+            margin-top: 3rem;
+            padding: 2rem 0;
+            background-color: #212529;
+        }
+        .terminal {
+            background-color: #000;
+            color: #0f0;
+            font-family: monospace;
+            padding: 10px;
+            border-radius: 4px;
+            margin-bottom: 20px;
+            white-space: pre-wrap;
+        }
+    </style>
+"""
+INTERACTIVE_FORM_HTML = """
+    <div class="container main-content">
+        <div class="header-box">
+            <h1>efenow's NTFY.sh Interactive Sender</h1>
+            <p class="lead">Fill in the form to send a notification</p>
+        </div>
+
+        <div class="form-container">
+            <div class="card mb-4">
+                <div class="card-header">
+                    <h4>Send Notification</h4>
+                </div>
+                <div class="card-body">
+                    <form action="/send-notification" method="post">
+                        <div class="mb-3">
+                            <label for="title" class="form-label">Notification Title</label>
+                            <input type="text" class="form-control" id="title" name="title" value="Alert" required>
+                        </div>
+                        <div class="mb-3">
+                            <label for="message" class="form-label">Message Body</label>
+                            <textarea class="form-control" id="message" name="message" rows="3" required>Notification from Replit</textarea>
+                        </div>
+                        <div class="mb-3">
+                            <label for="topic" class="form-label">Topic (without ntfy.sh/, comma-separate several)</label>
+                            <input type="text" class="form-control" id="topic" name="topic" value="my_test" required>
+                        </div>
+                        <div class="mb-3">
+                            <label for="tags" class="form-label">Tags (comma-separated)</label>
+                            <input type="text" class="form-control" id="tags" name="tags" value="info">
+                        </div>
+                        <div class="mb-3">
+                            <label for="priority" class="form-label">Priority (1-5)</label>
+                            <select class="form-select" id="priority" name="priority">
+                                <option value="1">1 - Min</option>
+                                <option value="2">2 - Low</option>
+                                <option value="3" selected>3 - Default</option>
+                                <option value="4">4 - High</option>
+                                <option value="5">5 - Max</option>
+                            </select>
+                        </div>
+                        <button type="submit" class="btn btn-primary">Send Notification</button>
+                        <a href="/" class="btn btn-secondary ms-2">Back to Home</a>
+                    </form>
+                </div>
+            </div>
+        </div>
+    </div>
+
+    <footer>
+        <div class="container">
+            <div class="row">
+                <div class="col-md-6">
+                    <h5>About efenow's NTFY.sh Sender</h5>
+                    <p>efenow's NTFY.sh Sender is a customized tool that lets you send notifications to your phone or desktop using the NTFY.sh service.</p>
+                </div>
+                <div class="col-md-6">
+                    <h5>Related Links</h5>
+                    <ul class="list-unstyled">
+                        <li><a href="https://ntfy.sh" class="text-decoration-none">NTFY.sh Website</a></li>
+                        <li><a href="https://docs.ntfy.sh" class="text-decoration-none">NTFY.sh Documentation</a></li>
+                    </ul>
+                </div>
+            </div>
+        </div>
+    </footer>
+"""
+
+# Body of the page shown for any unexpected error; the details go to the log instead
+ERROR_HTML = """
+    <div class="container mt-4">
+        <div class="alert alert-danger" role="alert">
+            <h4 class="alert-heading">Something went wrong</h4>
+            <p>The request could not be completed. Please try again later.</p>
+        </div>
+        <a href="/" class="btn btn-primary">Back to Home</a>
+    </div>
+"""
+
+# Result pages, compiled once when the app is created (see _get_app). Each
+# page fills in the blocks of the shared base page, and Jinja escapes every
+# value put into them.
+_TEMPLATE_SOURCES = {
+    "base.html": """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{% block title %}{% endblock %}</title>
+    <link href="{{ bootstrap_css }}" rel="stylesheet">
+    <link href="{{ results_css }}" rel="stylesheet">
+</head>
+<body data-bs-theme="dark">
+    <div class="container main-content">
+{% block content %}
+{% endblock %}
+    </div>
+{% block footer %}
+{% endblock %}
 </body>
 </html>
-"""
+""",
+    "send_success.html": """{% extends "base.html" %}
+{% block title %}Notification Sent{% endblock %}
+{% block content %}
+        <div class="alert alert-success mt-4" role="alert">
+            <h4 class="alert-heading">Success!</h4>
+            <p>Your notification was sent to ntfy.sh/{{ topic }}</p>
+        </div>
 
-@app.route('/')
-def index():
-    """Render the main interface page"""
-    return render_template_string(HTML_TEMPLATE)
+        <div class="card">
+            <div class="card-header">
+                <h5>Notification Details</h5>
+            </div>
+            <div class="card-body">
+                <ul class="list-group list-group-flush">
+                    <li class="list-group-item"><strong>Topic:</strong> ntfy.sh/{{ topic }}</li>
+                    <li class="list-group-item"><strong>Title:</strong> {{ title }}</li>
+                    <li class="list-group-item"><strong>Message:</strong> {{ message }}</li>
+                    <li class="list-group-item"><strong>Tags:</strong> {{ tags }}</li>
+                    <li class="list-group-item"><strong>Priority:</strong> {{ priority }}</li>
+                </ul>
+            </div>
+        </div>
 
-@app.route('/run-interactive')
-def run_interactive():
-    """Run the interactive script and return results"""
-    try:
-        # Get the full path to interactive_ntfy.py
-        script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "interactive_ntfy.py")
+        <h5 class="mt-4">Server Response:</h5>
+        <div class="terminal">
+{{ output }}
+        </div>
+
+        <div class="mt-4">
+            <a href="/run-interactive" class="btn btn-primary">Send Another</a>
+            <a href="/" class="btn btn-secondary">Back to Home</a>
+        </div>
+{% endblock %}
+""",
+    "ntfy_test.html": """{% extends "base.html" %}
+{% block title %}NTFY Test Results{% endblock %}
+{% block content %}
+        <h1 class="my-4">NTFY Test Results</h1>
+        
+        <div class="alert alert-success" role="alert">
+            <h4 class="alert-heading">Success!</h4>
+            <p>The NTFY test was executed successfully to ntfy.sh/{{ topic }}</p>
+        </div>
         
-        # Create a unique pipe-based input to simulate interactive input
-        # We're providing default values that will be displayed in the web UI
-        process = subprocess.Popen(
-            [sys.executable, script_path],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True
-        )
+        <h5>Command Output:</h5>
+        <div class="terminal">
+{{ output }}
+        </div>
         
-        # Capture just the initial output without sending input
-        initial_output, _ = process.communicate(input="", timeout=1)
-        process.terminate()
+        <div class="mt-4 mb-5">
+            <a href="/" class="btn btn-primary">Back to Home</a>
+        </div>
+{% endblock %}
+""",
+    "ntfy_loop.html": """{% extends "base.html" %}
+{% block title %}NTFY Loop{% endblock %}
+{% block content %}
+        <div class="card mb-4 mt-4">
+            <div class="card-header">
+                <h5>Loop Configuration</h5>
+            </div>
+            <div class="card-body">
+                <ul class="list-group list-group-flush">
+                    <li class="list-group-item"><strong>Topic:</strong> ntfy.sh/{{ topic }}</li>
+                    <li class="list-group-item"><strong>Title:</strong> {{ title }}</li>
+                    <li class="list-group-item"><strong>Message:</strong> {{ message }}</li>
+                    <li class="list-group-item"><strong>Tags:</strong> {{ tags }}</li>
+                    <li class="list-group-item"><strong>Priority:</strong> {{ priority or "" }}</li>
+                    <li class="list-group-item"><strong>Interval:</strong> {{ interval_value }} {{ interval_unit }} ({{ interval_in_seconds }} seconds)</li>
+                    <li class="list-group-item"><strong>Total Messages:</strong> {{ iterations }}{% if iterations == max_iterations %} (the most a loop sends){% endif %}</li>
+                </ul>
+            </div>
+        </div>
+        
+        <h5 class="mt-4">Command Output:</h5>
+        <div class="terminal">
+{% for line in output %}
+{{ line }}
+{% endfor %}
+        </div>
+        
+        <div class="alert alert-success" role="alert">
+            <h4 class="alert-heading">NTFY Loop Complete!</h4>
+            <p>Your notification loop to ntfy.sh/{{ topic }} has finished.</p>
+        </div>
         
-        # Return a page with the prompt and a form
-        form_html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>NTFY.sh Interactive Sender</title>
-            <link href="https://cdn.replit.com/agent/bootstrap-agent-dark-theme.min.css" rel="stylesheet">
-            <style>
-                body {{
-                    padding-top: 2rem;
-                    min-height: 100vh;
-                    display: flex;
-                    flex-direction: column;
-                }}
-                .main-content {{
-                    flex: 1;
-                }}
-                .header-box {{
-                    background-color: #212529;
-                    border-radius: 6px;
-                    padding: 15px;
-                    margin-bottom: 2rem;
-                    text-align: center;
-                }}
-                .form-container {{
-                    max-width: 700px;
-                    margin: 0 auto;
-                }}
-                .card {{
-                    margin-bottom: 1rem;
-                    background-color: #2d3338;
-                    border: 1px solid #343a40;
-                }}
-                footer {{
-                    margin-top: 3rem;
-                    padding: 2rem 0;
-                    background-color: #212529;
-                }}
-                .terminal {{
-                    background-color: #000;
-                    color: #0f0;
-                    font-family: monospace;
-                    padding: 10px;
-                    border-radius: 4px;
-                    margin-bottom: 20px;
-                    white-space: pre-wrap;
-                }}
-            </style>
-        </head>
-        <body data-bs-theme="dark">
-            <div class="container main-content">
-                <div class="header-box">
-                    <h1>efenow's NTFY.sh Interactive Sender</h1>
-                    <p class="lead">Fill in the form to send a notification</p>
+        <div class="mt-4">
+            <a href="/" class="btn btn-primary">Back to Home</a>
+        </div>
+{% endblock %}
+{% block footer %}
+    
+    <footer class="mt-5">
+        <div class="container">
+            <div class="row">
+                <div class="col-md-6">
+                    <h5>About efenow's NTFY.sh Sender</h5>
+                    <p>efenow's NTFY.sh Sender is a customized tool that lets you send notifications to your phone or desktop using the NTFY.sh service.</p>
                 </div>
-                
-                <div class="form-container">
-                    <div class="card mb-4">
-                        <div class="card-header">
-                            <h4>Send Notification</h4>
-                        </div>
-                        <div class="card-body">
-                            <form action="/send-notification" method="post">
-                                <div class="mb-3">
-                                    <label for="title" class="form-label">Notification Title</label>
-                                    <input type="text" class="form-control" id="title" name="title" value="Alert" required>
-                                </div>
-                                <div class="mb-3">
-                                    <label for="message" class="form-label">Message Body</label>
-                                    <textarea class="form-control" id="message" name="message" rows="3" required>Notification from Replit</textarea>
-                                </div>
-                                <div class="mb-3">
-                                    <label for="topic" class="form-label">Topic (without ntfy.sh/)</label>
-                                    <input type="text" class="form-control" id="topic" name="topic" value="my_test" required>
-                                </div>
-                                <div class="mb-3">
-                                    <label for="tags" class="form-label">Tags (comma-separated)</label>
-                                    <input type="text" class="form-control" id="tags" name="tags" value="info">
-                                </div>
-                                <div class="mb-3">
-                                    <label for="priority" class="form-label">Priority (1-5)</label>
-                                    <select class="form-select" id="priority" name="priority">
-                                        <option value="1">1 - Min</option>
-                                        <option value="2">2 - Low</option>
-                                        <option value="3" selected>3 - Default</option>
-                                        <option value="4">4 - High</option>
-                                        <option value="5">5 - Max</option>
-                                    </select>
-                                </div>
-                                <button type="submit" class="btn btn-primary">Send Notification</button>
-                                <a href="/" class="btn btn-secondary ms-2">Back to Home</a>
-                            </form>
-                        </div>
-                    </div>
+                <div class="col-md-6">
+                    <h5>Related Links</h5>
+                    <ul class="list-unstyled">
+                        <li><a href="https://ntfy.sh" class="text-decoration-none">NTFY.sh Website</a></li>
+                        <li><a href="https://docs.ntfy.sh" class="text-decoration-none">NTFY.sh Documentation</a></li>
+                    </ul>
                 </div>
             </div>
-            
-            <footer>
-                <div class="container">
-                    <div class="row">
-                        <div class="col-md-6">
-                            <h5>About efenow's NTFY.sh Sender</h5>
-                            <p>efenow's NTFY.sh Sender is a customized tool that lets you send notifications to your phone or desktop using the NTFY.sh service.</p>
-                        </div>
-                        <div class="col-md-6">
-                            <h5>Related Links</h5>
-                            <ul class="list-unstyled">
-                                <li><a href="https://ntfy.sh" class="text-decoration-none">NTFY.sh Website</a></li>
-                                <li><a href="https://docs.ntfy.sh" class="text-decoration-none">NTFY.sh Documentation</a></li>
-                            </ul>
-                        </div>
-                    </div>
-                </div>
-            </footer>
-        </body>
-        </html>
-        """
-        return form_html
-    except Exception as e:
-        return f"Error: {str(e)}", 500
+        </div>
+    </footer>
+{% endblock %}
+""",
+    "curl.html": """{% extends "base.html" %}
+{% block title %}Curl Loop Test Results{% endblock %}
+{% block content %}
+        <h1 class="my-4">Curl Loop Test Results</h1>
+        
+        <div class="alert alert-success" role="alert">
+            <h4 class="alert-heading">Success!</h4>
+            <p>The Curl Loop test was executed successfully.</p>
+        </div>
+        
+        <h5>Command Output:</h5>
+        <div class="terminal">
+{{ output }}
+        </div>
+        
+        <div class="mt-4 mb-5">
+            <a href="/" class="btn btn-primary">Back to Home</a>
+        </div>
+{% endblock %}
+""",
+}
+_TEMPLATES = {}
+
+def _precompute_page(source, mimetype="text/html"):
+    """
+    Encode and compress a page with no dynamic content once, up front.
+    
+    Args:
+        source: The page's text.
+        mimetype: The page's MIME type.
+    
+    Returns:
+        A dict with the page's MIME type, ETag and its body for each available
+        content coding.
+    """
+    body = source.encode("utf-8")
+    encodings = {
+        "identity": body,
+        "gzip": gzip.compress(body, compresslevel=9),
+    }
+    if brotli is not None:
+        encodings["br"] = brotli.compress(body, quality=11)
+    return {"mimetype": mimetype, "etag": hashlib.md5(body).hexdigest(), "encodings": encodings}
+
+def _read_asset(filename):
+    """
+    Read one of the page's assets.
+    
+    Args:
+        filename: The asset's file name in the static directory.
+    
+    Returns:
+        The asset's text.
+    """
+    with open(os.path.join(_STATIC_DIR, filename), encoding="utf-8") as f:
+        return f.read()
+
+# The assets and pages have no dynamic content, so encode them once and serve the bytes
+_STATIC_ASSETS = {
+    "app.css": _precompute_page(_read_asset("app.css"), "text/css"),
+    "app.js": _precompute_page(_read_asset("app.js"), "text/javascript"),
+    "results.css": _precompute_page(_read_asset("results.css"), "text/css"),
+}
+
+def _asset_url(filename):
+    """
+    Get the versioned URL of an asset.
+    
+    Args:
+        filename: The asset's file name in the static directory.
+    
+    Returns:
+        The URL, which changes whenever the asset does.
+    """
+    return f"/static/{filename}?v={_STATIC_ASSETS[filename]['etag'][:8]}"
+
+def _shell_page(title, body, head=""):
+    """
+    Fill in the shared page shell; done once per page at import.
+    
+    Args:
+        title: The page title.
+        body: The contents of <body>.
+        head: Tags to add to <head> after the Bootstrap theme.
+    
+    Returns:
+        The complete page as a string.
+    """
+    return PAGE_SHELL.substitute(title=title, bootstrap_css=BOOTSTRAP_CDN_URL, head=head, body=body)
+
+_INDEX_PAGE = _precompute_page(_shell_page(
+    "efenow's NTFY.SH Sender",
+    HTML_TEMPLATE,
+    head=(f'    <link href="{_asset_url("app.css")}" rel="stylesheet">\n'
+          f'    <script src="{_asset_url("app.js")}" defer></script>\n'),
+))
+_INTERACTIVE_FORM_PAGE = _precompute_page(_shell_page(
+    "NTFY.sh Interactive Sender", INTERACTIVE_FORM_HTML, head=INTERACTIVE_FORM_STYLE.lstrip("\n")))
+_ERROR_PAGE = _shell_page("Something Went Wrong", ERROR_HTML).encode("utf-8")
+
+# Versioned asset URLs never change content, so they can be cached for a year
+ASSET_MAX_AGE = 31536000
+
+def _static_page(page, cache_control="public, max-age=300"):
+    """
+    Serve a precomputed page in the best encoding the client accepts.
+    
+    Conditional requests are answered with 304.
+    
+    Args:
+        page: The page from _precompute_page.
+        cache_control: The response's Cache-Control header.
+    
+    Returns:
+        The response for the current request.
+    """
+    encodings = page["encodings"]
+    encoding = request.accept_encodings.best_match(
+        [e for e in ("br", "gzip") if e in encodings]
+    ) or "identity"
+    
+    response = Response(encodings[encoding], mimetype=page["mimetype"])
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = cache_control
+    # Each encoding is a different representation, so it needs its own tag
+    response.set_etag(page["etag"] if encoding == "identity" else f"{page['etag']}-{encoding}")
+    return response.make_conditional(request)
+
+# Notifications are sent by a single background thread that keeps the
+# connection to ntfy.sh open between sends; views hand it work through this queue
+_SEND_QUEUE = queue.Queue()
+_sender_thread = None
+_sender_lock = threading.Lock()
+
+# Notifications sent at once by the background sender; any more queued up
+# wait for one of them to finish
+SEND_CONCURRENCY = 64
+
+# Lines of a loop's output kept for its result page
+OUTPUT_MAX_LINES = 4096
+
+# Seconds per interval unit of the loop form
+INTERVAL_UNITS = {"seconds": 1, "minutes": 60, "hours": 3600}
+
+# Limits for loops started from the page, so no request runs without end
+MAX_ITERATIONS = 1000
+MIN_INTERVAL = 1
+MAX_INTERVAL = 3600
+
+def _send_queued(future, kwargs):
+    """Send one queued notification and resolve its future with the result."""
+    try:
+        future.set_result(send_ntfy_message(**kwargs))
+    except BaseException as e:
+        future.set_exception(e)
+
+def _sender_worker():
+    """Send queued notifications as they arrive, for the life of the process."""
+    # Every notification is sent from the pool the moment it is queued, so
+    # concurrent ones go out as parallel streams on the shared client's one
+    # HTTP/2 connection, and one waiting out a retry holds up only its own
+    # thread. This uses threads rather than asyncio: under gunicorn's gevent
+    # worker the threads are greenlets, and an event loop running in one
+    # greenlet would stop asyncio from being used in any other.
+    with ThreadPoolExecutor(max_workers=SEND_CONCURRENCY, thread_name_prefix="ntfy-send") as pool:
+        while True:
+            future, kwargs = _SEND_QUEUE.get()
+            if future.set_running_or_notify_cancel():
+                pool.submit(_send_queued, future, kwargs)
+
+def queue_notification(**kwargs):
+    """
+    Queue a notification for the background sender.
+    
+    Args:
+        **kwargs: Arguments for ntfy_loop.send_ntfy_message.
+    
+    Returns:
+        A Future resolving to the send result, shaped like a curl run.
+    """
+    global _sender_thread
+    # Start the sender on first use, so it runs in the process serving requests
+    with _sender_lock:
+        if _sender_thread is None or not _sender_thread.is_alive():
+            _sender_thread = threading.Thread(target=_sender_worker, name="ntfy-sender", daemon=True)
+            _sender_thread.start()
+    
+    future = Future()
+    _SEND_QUEUE.put((future, kwargs))
+    return future
+
+# Names ntfy.sh accepts for a topic, the characters allowed in tags, and
+# titles, which are sent as a header and so may not contain line breaks or
+# other control characters
+_TOPIC_RE = re.compile(r"\A[A-Za-z0-9_\-]{1,64}\Z")
+_TAGS_RE = re.compile(r"\A[A-Za-z0-9_+,\- ]{0,128}\Z")
+_TITLE_RE = re.compile(r"\A[^\x00-\x1f\x7f]{0,256}\Z")
+
+def _invalid_fields(topics, tags, title=""):
+    """
+    Check a request's topics, tags and title before anything is sent.
+    
+    ntfy.sh rejects invalid topics, so catching them here saves sending
+    messages that can only fail.
+    
+    Args:
+        topics: The topics to send to.
+        tags: The comma-separated tags, or an empty string for none.
+        title: The notification title, or an empty string for none.
+    
+    Returns:
+        A 400 response naming the first invalid value, or None if all are valid.
+    """
+    if not topics:
+        return Response("Invalid topic: no topic given", status=400, mimetype="text/plain")
+    for topic in topics:
+        if not _TOPIC_RE.match(topic):
+            return Response(f"Invalid topic: {topic}", status=400, mimetype="text/plain")
+    if tags and not _TAGS_RE.match(tags):
+        return Response(f"Invalid tags: {tags}", status=400, mimetype="text/plain")
+    if title and not _TITLE_RE.match(title):
+        return Response("Invalid title", status=400, mimetype="text/plain")
+    return None
+
+def _form_int(name: str, default: int, low: int, high: int) -> int:
+    """
+    Read a whole number from the submitted form, clamped to a range.
+    
+    Args:
+        name: The form field.
+        default: The value when the field is missing.
+        low: The smallest value allowed.
+        high: The largest value allowed.
+    
+    Returns:
+        The field's value, raised or lowered into the range.
+    
+    Raises:
+        ValueError: If the field is not a whole number.
+    """
+    return max(low, min(high, int(request.form.get(name, default))))
+
+def _error_response(message: str):
+    """
+    Build an error response that is never rendered as HTML.
+    
+    Error messages can contain user input (a topic or title echoed back by
+    the ntfy server, for example), so they are returned as plain text.
+    
+    Args:
+        message: The error message to show.
+    
+    Returns:
+        A text/plain 500 response.
+    """
+    return Response(f"Error: {message}", status=500, mimetype="text/plain")
+
+def index():
+    """Render the main interface page"""
+    return _static_page(_INDEX_PAGE)
+
+def static_asset(filename):
+    """Serve one of the pages' scripts or stylesheets."""
+    page = _STATIC_ASSETS.get(filename)
+    if page is None:
+        return Response("Not found", status=404, mimetype="text/plain")
+    # Only the URL for the current version may be cached for good
+    if request.args.get("v") == page["etag"][:8]:
+        return _static_page(page, f"public, max-age={ASSET_MAX_AGE}, immutable")
+    return _static_page(page)
+
+def run_interactive():
+    """Show the form for sending a notification interactively"""
+    # The page is the web version of interactive_ntfy.py's prompts, so there
+    # is nothing to run before showing it
+    return _static_page(_INTERACTIVE_FORM_PAGE)
 
-@app.route('/send-notification', methods=['POST'])
 def send_notification():
-    """Process the notification form and send using the ntfy_loop.py script"""
+    """Process the notification form and send the notification"""
     
     try:
         # Get form data
@@ -706,190 +780,81 @@ def send_notification():
         tags = request.form.get('tags', 'info')
         priority = request.form.get('priority', '3')
         
-        # Build command with proper arguments
-        cmd = [
-            sys.executable, 
-            "ntfy_loop.py", 
-            "--topic", topic,
-            "--message", message,
-            "--title", title
+        # Several comma-separated topics are queued together, so the sender
+        # sends them concurrently over its connection
+        topics = [t.strip() for t in topic.split(',') if t.strip()] or ['my_test']
+        invalid = _invalid_fields(topics, tags, title)
+        if invalid is None and priority not in ('', '1', '2', '3', '4', '5'):
+            invalid = Response("Invalid priority", status=400, mimetype="text/plain")
+        if invalid is not None:
+            return invalid
+        topic = ', '.join(topics)
+        send_tags = tags or None
+        send_priority = int(priority) if priority else None
+        
+        # Send the notification in-process from the background sender
+        futures = [
+            queue_notification(
+                topic=t,
+                message=message,
+                title=title,
+                tags=send_tags,
+                priority=send_priority
+            )
+            for t in topics
         ]
+        results = [future.result(timeout=30) for future in futures]
         
-        if tags:
-            cmd.extend(["--tags", tags])
-        
-        if priority:
-            cmd.extend(["--priority", priority])
-            
-        # Add iterations to send just one message
-        cmd.extend(["--iterations", "1"])
-        
-        # Execute the command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        failed = [(t, r) for t, r in zip(topics, results) if r.returncode != 0]
+        if failed:
+            errors = "\n".join(f"{t}: code {r.returncode}: {r.stderr}" for t, r in failed)
+            return _error_response(f"Failed to send notification\n\n{errors}")
+        output = "\n".join(r.stdout.strip() for r in results)
         
         # Return success page with output
-        success_html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Notification Sent</title>
-            <link href="https://cdn.replit.com/agent/bootstrap-agent-dark-theme.min.css" rel="stylesheet">
-            <style>
-                body {{
-                    padding-top: 2rem;
-                    min-height: 100vh;
-                    display: flex;
-                    flex-direction: column;
-                }}
-                .main-content {{
-                    flex: 1;
-                }}
-                .terminal {{
-                    background-color: #1e1e1e;
-                    color: #0f0;
-                    font-family: monospace;
-                    padding: 15px;
-                    border-radius: 6px;
-                    margin: 20px 0;
-                    white-space: pre-wrap;
-                    max-height: 300px;
-                    overflow-y: auto;
-                }}
-            </style>
-        </head>
-        <body data-bs-theme="dark">
-            <div class="container main-content">
-                <div class="alert alert-success mt-4" role="alert">
-                    <h4 class="alert-heading">Success!</h4>
-                    <p>Your notification was sent to ntfy.sh/{topic}</p>
-                </div>
-                
-                <div class="card">
-                    <div class="card-header">
-                        <h5>Notification Details</h5>
-                    </div>
-                    <div class="card-body">
-                        <ul class="list-group list-group-flush">
-                            <li class="list-group-item"><strong>Topic:</strong> ntfy.sh/{topic}</li>
-                            <li class="list-group-item"><strong>Title:</strong> {title}</li>
-                            <li class="list-group-item"><strong>Message:</strong> {message}</li>
-                            <li class="list-group-item"><strong>Tags:</strong> {tags}</li>
-                            <li class="list-group-item"><strong>Priority:</strong> {priority}</li>
-                        </ul>
-                    </div>
-                </div>
-                
-                <h5 class="mt-4">Command Output:</h5>
-                <div class="terminal">
-{result.stdout}
-                </div>
-                
-                <div class="mt-4">
-                    <a href="/run-interactive" class="btn btn-primary">Send Another</a>
-                    <a href="/" class="btn btn-secondary">Back to Home</a>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        return success_html
+        return _TEMPLATES["send_success.html"].render(
+            topic=topic,
+            title=title,
+            message=message,
+            tags=tags,
+            priority=priority,
+            output=output
+        )
         
-    except subprocess.CalledProcessError as e:
-        error_message = f"Command failed with return code {e.returncode}\n\nStdout:\n{e.stdout}\n\nStderr:\n{e.stderr}"
-        return f"Error: {error_message}", 500
-    except Exception as e:
-        return f"Error: {str(e)}", 500
+    except Exception:
+        _app.logger.exception("Sending the notification failed")
+        abort(500)
     
-@app.route('/run-ntfy-test')
 def run_ntfy_test():
     """Run the ntfy test workflow and display the results"""
     try:
         # Get the topic from the query parameter or use default
         topic = request.args.get('topic', 'my_test')
-        
-        # Execute the ntfy test command
-        result = subprocess.run(
-            [
-                sys.executable, 
-                "ntfy_loop.py", 
-                "--topic", topic,
-                "--message", "Test message from Replit", 
-                "--title", "efenow's Test Alert", 
-                "--tags", "warning,test", 
-                "--interval", "2", 
-                "--iterations", "1", 
-                "--verbose"
-            ],
-            capture_output=True,
-            text=True,
-            check=True
+        invalid = _invalid_fields([topic], "")
+        if invalid is not None:
+            return invalid
+        
+        # Run the ntfy test in-process
+        result = ntfy_run(
+            topic=topic,
+            message="Test message from Replit",
+            title="efenow's Test Alert",
+            tags="warning,test",
+            interval=2,
+            iterations=1,
+            verbose=True,
+            max_lines=OUTPUT_MAX_LINES
         )
         
         # Format the output in a nice HTML page
-        output_html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>NTFY Test Results</title>
-            <link href="https://cdn.replit.com/agent/bootstrap-agent-dark-theme.min.css" rel="stylesheet">
-            <style>
-                body {{
-                    padding-top: 2rem;
-                    min-height: 100vh;
-                    display: flex;
-                    flex-direction: column;
-                }}
-                .main-content {{
-                    flex: 1;
-                }}
-                .terminal {{
-                    background-color: #1e1e1e;
-                    color: #0f0;
-                    font-family: monospace;
-                    padding: 15px;
-                    border-radius: 6px;
-                    margin: 20px 0;
-                    white-space: pre-wrap;
-                    max-height: 400px;
-                    overflow-y: auto;
-                }}
-            </style>
-        </head>
-        <body data-bs-theme="dark">
-            <div class="container main-content">
-                <h1 class="my-4">NTFY Test Results</h1>
-                
-                <div class="alert alert-success" role="alert">
-                    <h4 class="alert-heading">Success!</h4>
-                    <p>The NTFY test was executed successfully to ntfy.sh/{topic}</p>
-                </div>
-                
-                <h5>Command Output:</h5>
-                <div class="terminal">
-{result.stdout}
-                </div>
-                
-                <div class="mt-4 mb-5">
-                    <a href="/" class="btn btn-primary">Back to Home</a>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        return output_html
-    except Exception as e:
-        return f"Error running NTFY test: {str(e)}", 500
+        # Show the whole log when a message failed, instead of a success page
+        if result.returncode != 0:
+            return _error_response(f"The NTFY test failed\n\n{result.stdout}")
+        return _TEMPLATES["ntfy_test.html"].render(topic=topic, output=result.stdout)
+    except Exception:
+        _app.logger.exception("Running the NTFY test failed")
+        abort(500)
 
-@app.route('/run-ntfy-loop', methods=['POST'])
 def run_ntfy_loop():
     """Process the notification loop form and send recurring notifications"""
     
@@ -899,255 +864,153 @@ def run_ntfy_loop():
         message = request.form.get('message', 'Periodic notification from Replit')
         topic = request.form.get('topic', 'my_test')
         tags = request.form.get('tags', 'repeat,clock')
-        priority = request.form.get('priority', '3')
+        invalid = _invalid_fields([t.strip() for t in topic.split(',') if t.strip()], tags, title)
+        if invalid is not None:
+            return invalid
         
-        # Handle interval value and unit
-        interval_value = request.form.get('interval_value', '30')
+        # Read the numbers, keeping the loop within the limits. "Forever"
+        # sends the most messages a loop may. An interval outside the limits
+        # is refused rather than changed, so the loop runs as the page says.
         interval_unit = request.form.get('interval_unit', 'seconds')
-        
-        # Convert interval to seconds based on the unit
-        interval_in_seconds = str(int(interval_value))
-        if interval_unit == 'minutes':
-            interval_in_seconds = str(int(interval_value) * 60)
-        elif interval_unit == 'hours':
-            interval_in_seconds = str(int(interval_value) * 3600)
-        
-        # Handle infinite loop option
         infinite_loop = request.form.get('infinite_loop') == 'on'
-        iterations = '999999' if infinite_loop else request.form.get('iterations_value', '5')
-        
-        # Build command with proper arguments
-        cmd = [
-            sys.executable, 
-            "ntfy_loop.py", 
-            "--topic", topic,
-            "--message", message,
-            "--title", title,
-            "--interval", interval_in_seconds,
-            "--iterations", iterations
-        ]
-        
-        if tags:
-            cmd.extend(["--tags", tags])
-        
-        if priority:
-            cmd.extend(["--priority", priority])
-            
-        # Execute the command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
+        try:
+            interval_value = int(request.form.get('interval_value', 30))
+            interval_in_seconds = interval_value * INTERVAL_UNITS[interval_unit]
+            if not MIN_INTERVAL <= interval_in_seconds <= MAX_INTERVAL:
+                raise ValueError(f"interval of {interval_in_seconds} seconds")
+            iterations = MAX_ITERATIONS if infinite_loop else _form_int('iterations_value', 5, 1, MAX_ITERATIONS)
+            priority = _form_int('priority', 3, 1, 5) if request.form.get('priority', '3') else None
+        except (ValueError, KeyError):
+            return Response(
+                f"Invalid loop settings\n\nThe interval must be {MIN_INTERVAL} to {MAX_INTERVAL} seconds.",
+                status=400,
+                mimetype="text/plain"
+            )
+        
+        # Run the loop in the background, streaming its output into the page
+        # as it is logged. The loop stops if the client goes away.
+        output = ntfy_stream(
+            topic=topic,
+            message=message,
+            title=title,
+            tags=tags or None,
+            interval=interval_in_seconds,
+            iterations=iterations,
+            priority=priority
         )
-        
-        # Return success page with output
-        success_html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>NTFY Loop Complete</title>
-            <link href="https://cdn.replit.com/agent/bootstrap-agent-dark-theme.min.css" rel="stylesheet">
-            <style>
-                body {{
-                    padding-top: 2rem;
-                    min-height: 100vh;
-                    display: flex;
-                    flex-direction: column;
-                }}
-                .main-content {{
-                    flex: 1;
-                }}
-                .terminal {{
-                    background-color: #1e1e1e;
-                    color: #0f0;
-                    font-family: monospace;
-                    padding: 15px;
-                    border-radius: 6px;
-                    margin: 20px 0;
-                    white-space: pre-wrap;
-                    max-height: 400px;
-                    overflow-y: auto;
-                }}
-                .notification-info {{
-                    background-color: #2d3338;
-                    border-radius: 6px;
-                    padding: 15px;
-                    margin-bottom: 20px;
-                }}
-            </style>
-        </head>
-        <body data-bs-theme="dark">
-            <div class="container main-content">
-                <div class="alert alert-success mt-4" role="alert">
-                    <h4 class="alert-heading">NTFY Loop Complete!</h4>
-                    <p>Your notification loop to ntfy.sh/{topic} has finished.</p>
-                </div>
-                
-                <div class="card mb-4">
-                    <div class="card-header">
-                        <h5>Loop Configuration</h5>
-                    </div>
-                    <div class="card-body">
-                        <ul class="list-group list-group-flush">
-                            <li class="list-group-item"><strong>Topic:</strong> ntfy.sh/{topic}</li>
-                            <li class="list-group-item"><strong>Title:</strong> {title}</li>
-                            <li class="list-group-item"><strong>Message:</strong> {message}</li>
-                            <li class="list-group-item"><strong>Tags:</strong> {tags}</li>
-                            <li class="list-group-item"><strong>Priority:</strong> {priority}</li>
-                            <li class="list-group-item"><strong>Interval:</strong> {interval_value} {interval_unit} ({interval_in_seconds} seconds)</li>
-                            <li class="list-group-item"><strong>Total Messages:</strong> {iterations if not infinite_loop else "∞ (Forever)"}</li>
-                        </ul>
-                    </div>
-                </div>
-                
-                <h5 class="mt-4">Command Output:</h5>
-                <div class="terminal">
-{result.stdout}
-                </div>
-                
-                <div class="mt-4">
-                    <a href="/" class="btn btn-primary">Back to Home</a>
-                </div>
-            </div>
-            
-            <footer class="mt-5">
-                <div class="container">
-                    <div class="row">
-                        <div class="col-md-6">
-                            <h5>About efenow's NTFY.sh Sender</h5>
-                            <p>efenow's NTFY.sh Sender is a customized tool that lets you send notifications to your phone or desktop using the NTFY.sh service.</p>
-                        </div>
-                        <div class="col-md-6">
-                            <h5>Related Links</h5>
-                            <ul class="list-unstyled">
-                                <li><a href="https://ntfy.sh" class="text-decoration-none">NTFY.sh Website</a></li>
-                                <li><a href="https://docs.ntfy.sh" class="text-decoration-none">NTFY.sh Documentation</a></li>
-                            </ul>
-                        </div>
-                    </div>
-                </div>
-            </footer>
-        </body>
-        </html>
-        """
-        return success_html
-        
-    except subprocess.CalledProcessError as e:
-        error_message = f"Command failed with return code {e.returncode}\n\nStdout:\n{e.stdout}\n\nStderr:\n{e.stderr}"
-        return f"Error: {error_message}", 500
-    except Exception as e:
-        return f"Error: {str(e)}", 500
+        page = _TEMPLATES["ntfy_loop.html"].generate(
+            topic=topic,
+            title=title,
+            message=message,
+            tags=tags,
+            priority=priority,
+            interval_value=interval_value,
+            interval_unit=interval_unit,
+            interval_in_seconds=interval_in_seconds,
+            iterations=iterations,
+            max_iterations=MAX_ITERATIONS,
+            output=output
+        )
+        # Ask proxies to pass each line on instead of buffering the page
+        response = Response(page, mimetype="text/html", headers={"X-Accel-Buffering": "no"})
+        response.call_on_close(output.close)
+        return response
+        
+    except Exception:
+        _app.logger.exception("Running the NTFY loop failed")
+        abort(500)
 
-@app.route('/run-curl-loop')
 def run_curl_loop():
     """Run the curl loop test workflow and display the results"""
     try:
-        # Execute the curl loop test command
-        result = subprocess.run(
-            [
-                sys.executable, 
-                "curl_loop.py", 
-                "-i", "2", 
-                "-n", "2", 
-                "-v", 
-                "https://httpbin.org/get"
-            ],
-            capture_output=True,
-            text=True,
-            check=True
+        # Run the curl loop test in-process
+        result = curl_run(
+            ["https://httpbin.org/get"],
+            interval=2,
+            iterations=2,
+            verbose=True,
+            max_lines=OUTPUT_MAX_LINES
         )
         
         # Format the output in a nice HTML page
-        output_html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Curl Loop Test Results</title>
-            <link href="https://cdn.replit.com/agent/bootstrap-agent-dark-theme.min.css" rel="stylesheet">
-            <style>
-                body {{
-                    padding-top: 2rem;
-                    min-height: 100vh;
-                    display: flex;
-                    flex-direction: column;
-                }}
-                .main-content {{
-                    flex: 1;
-                }}
-                .terminal {{
-                    background-color: #1e1e1e;
-                    color: #0f0;
-                    font-family: monospace;
-                    padding: 15px;
-                    border-radius: 6px;
-                    margin: 20px 0;
-                    white-space: pre-wrap;
-                    max-height: 400px;
-                    overflow-y: auto;
-                }}
-            </style>
-        </head>
-        <body data-bs-theme="dark">
-            <div class="container main-content">
-                <h1 class="my-4">Curl Loop Test Results</h1>
-                
-                <div class="alert alert-success" role="alert">
-                    <h4 class="alert-heading">Success!</h4>
-                    <p>The Curl Loop test was executed successfully.</p>
-                </div>
-                
-                <h5>Command Output:</h5>
-                <div class="terminal">
-{result.stdout}
-                </div>
-                
-                <div class="mt-4 mb-5">
-                    <a href="/" class="btn btn-primary">Back to Home</a>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        return output_html
-    except Exception as e:
-        return f"Error running Curl Loop test: {str(e)}", 500
+        # Show the whole log when a request failed, instead of a success page
+        if result.returncode != 0:
+            return _error_response(f"The Curl Loop test failed\n\n{result.stdout}")
+        return _TEMPLATES["curl.html"].render(output=result.stdout)
+    except Exception:
+        _app.logger.exception("Running the curl loop test failed")
+        abort(500)
 
-def main():
-    """
-    When script is run directly, launch interactive_ntfy.py
+def internal_error(e):
+    """Show the error page for any unexpected error"""
+    return Response(_ERROR_PAGE, status=500, mimetype="text/html")
+
+def _register_routes(app):
     """
-    # Get the full path to interactive_ntfy.py
-    script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "interactive_ntfy.py")
+    Register the view functions with the app.
     
-    # Check if interactive_ntfy.py exists
-    if not os.path.exists(script_path):
-        print(f"Error: {script_path} does not exist")
-        sys.exit(1)
-    
-    # Get any command line arguments passed to this script
-    args = sys.argv[1:]
+    Args:
+        app: The Flask app.
+    """
+    app.add_url_rule('/', view_func=index)
+    app.add_url_rule('/static/<filename>', view_func=static_asset)
+    app.add_url_rule('/run-interactive', view_func=run_interactive)
+    app.add_url_rule('/send-notification', view_func=send_notification, methods=['POST'])
+    app.add_url_rule('/run-ntfy-test', view_func=run_ntfy_test)
+    app.add_url_rule('/run-ntfy-loop', view_func=run_ntfy_loop, methods=['POST'])
+    app.add_url_rule('/run-curl-loop', view_func=run_curl_loop)
+    app.register_error_handler(500, internal_error)
+
+def _get_app():
+    """
+    Create the Flask app on first use.
     
-    # Create the command to run
-    cmd = [sys.executable, script_path] + args
+    Returns:
+        The Flask app, with its routes registered.
+    """
+    global _app, Response, abort, request
+    if _app is None:
+        from flask import Flask, Response, abort, request
+        import jinja2
+        # Compile the result pages once for the life of the process. The
+        # compiled code is also cached on disk, so later workers and restarts
+        # load it instead of compiling again. Jinja's default cache directory
+        # is private to the user, since the cache holds code that gets loaded.
+        environment = jinja2.Environment(
+            loader=jinja2.DictLoader(_TEMPLATE_SOURCES),
+            bytecode_cache=jinja2.FileSystemBytecodeCache(pattern="__ntfy_sender_%s.cache"),
+            autoescape=True,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        environment.globals["bootstrap_css"] = BOOTSTRAP_CDN_URL
+        environment.globals["results_css"] = _asset_url("results.css")
+        _TEMPLATES.update((name, environment.get_template(name)) for name in _TEMPLATE_SOURCES)
+        # The assets are served precompressed by static_asset instead
+        _app = Flask(__name__, static_folder=None)
+        _register_routes(_app)
+    return _app
+
+def __getattr__(name):
+    """Create the Flask app when `app` is first looked up, e.g. by gunicorn's main:app."""
+    if name == "app":
+        return _get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def main():
+    """
+    When script is run directly, run interactive_ntfy.py's sender
+    """
+    # The sender runs in this process, so launching it doesn't start and
+    # import everything into a second interpreter. It reads the same
+    # command line arguments from sys.argv.
+    import interactive_ntfy
     
     try:
-        # Execute interactive_ntfy.py as a subprocess
-        process = subprocess.run(cmd, check=True)
-        sys.exit(process.returncode)
+        interactive_ntfy.main()
     except KeyboardInterrupt:
         print("\nStopped by user")
         sys.exit(0)
-    except subprocess.CalledProcessError as e:
-        print(f"Error: Command failed with return code {e.returncode}")
-        sys.exit(e.returncode)
-    except Exception as e:
-        print(f"Error: {e}")
-        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,23 +1,143 @@
 #!/usr/bin/env python3
 
 import argparse
+import asyncio
+import collections
+import functools
+import importlib.util
 import logging
+import math
+import os
+import queue
+import random
+import shutil
 import signal
+import socket
+import ssl
 import subprocess
 import sys
+import threading
 import time
-from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 from typing import Optional, List, Union
 
+try:
+    import httpx
+except ImportError:
+    # Fall back to spawning the curl binary when httpx is not installed
+    httpx = None
+
+try:
+    import uvloop
+except ImportError:
+    # The asyncio runners use the default event loop without uvloop
+    uvloop = None
+
+# HTTP/2 support in httpx requires the optional h2 package
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Base URL of the ntfy server messages are published to
+NTFY_SERVER = "https://ntfy.sh"
+
+# Responses meaning the server did not take the message, so sending it again
+# can't deliver it twice, and how often and how long to back off before
+# retrying
+RETRY_STATUSES = frozenset({408, 429, 503})
+SEND_RETRIES = 3
+RETRY_BACKOFF = 0.5
+# A send isn't retried when the server asks for a longer wait than this in
+# its Retry-After header
+RETRY_MAX_WAIT = 10.0
+
+# Messages run_async keeps in flight at once; with a short interval it
+# dispatches faster than the server answers
+ASYNC_MAX_IN_FLIGHT = 64
+
+# Delivery delays ntfy.sh accepts, in seconds, for scheduling a loop's
+# messages on the server
+SCHEDULE_MIN_DELAY = 10
+SCHEDULE_MAX_DELAY = 3 * 24 * 3600
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
 logger = logging.getLogger(__name__)
 
-def send_ntfy_message(topic, message, title=None, tags=None, priority=None, delay=None):
+# httpx logs every request at INFO, which would duplicate our own message logs
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Times to retry opening a connection to the server. httpx only retries the
+# connection itself, never a request, so a message is not sent twice.
+CONNECT_RETRIES = 3
+
+def create_client(max_connections: int = 4, max_keepalive_connections: int = 1):
+    """
+    Create an HTTP client that keeps its connection to ntfy.sh alive between messages.
+    
+    Args:
+        max_connections (int): Connections to allow at once without HTTP/2
+        max_keepalive_connections (int): Idle connections to keep open for reuse
+    
+    Returns:
+        httpx.Client: A client with a keep-alive connection pool
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections
+    )
+    # The transport takes the pool settings, as a client given a transport
+    # ignores its own
+    return httpx.Client(
+        transport=httpx.HTTPTransport(http2=HTTP2_AVAILABLE, limits=limits, retries=CONNECT_RETRIES),
+        timeout=10.0
+    )
+
+def create_async_client(max_connections: int = 1):
+    """
+    Create an asynchronous HTTP client for sending messages concurrently.
+    
+    Args:
+        max_connections (int): Connections to allow without HTTP/2, which
+            multiplexes every concurrent message over a single one instead
+    
+    Returns:
+        httpx.AsyncClient: A client with a single keep-alive connection
+    """
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=1 if HTTP2_AVAILABLE else max_connections,
+            max_keepalive_connections=1
+        ),
+        timeout=10.0
+    )
+
+# Connections the shared client may open at once: the web app sends up to 64
+# messages concurrently, alongside any loops it is running
+SHARED_MAX_CONNECTIONS = 64
+SHARED_MAX_KEEPALIVE = 16
+
+def _create_shared_client():
+    """Create the client shared by one-off sends and the web app's loops."""
+    if httpx is None:
+        return None
+    return create_client(SHARED_MAX_CONNECTIONS, SHARED_MAX_KEEPALIVE)
+
+# Shared client for one-off sends, e.g. from interactive_ntfy.py and main.py
+_CLIENT = _create_shared_client()
+
+def _reset_client_after_fork():
+    """Give a forked child (e.g. a gunicorn worker) its own shared client."""
+    global _CLIENT
+    # The parent's pooled connections are left alone rather than closed, as
+    # closing them here would also end them for the parent
+    _CLIENT = _create_shared_client()
+
+os.register_at_fork(after_in_child=_reset_client_after_fork)
+
+def send_ntfy_message(topic, message, title=None, tags=None, priority=None, delay=None, client=None):
     """
     Send a message to ntfy.sh
     
@@ -28,11 +148,51 @@ def send_ntfy_message(topic, message, title=None, tags=None, priority=None, dela
         tags (str, optional): Comma-separated list of tags (e.g., "warning,skull")
         priority (int, optional): Priority level (1-5)
         delay (str, optional): Delivery delay (e.g., "10m", "1h")
+        client (httpx.Client, optional): Client to send with, defaulting to a shared one
     
     Returns:
-        subprocess.CompletedProcess: The result of the curl command
+        subprocess.CompletedProcess: The result of the request, shaped like a curl run
     """
-    curl_command = ["curl", "-s", f"https://ntfy.sh/{topic}"]
+    client = client or _CLIENT
+    if client is not None:
+        return _post_message(client, topic, message, title, tags, priority, delay)
+    
+    curl_command = _curl_command(f"{NTFY_SERVER}/{topic}", message, title, tags, priority, delay)
+    
+    try:
+        # Spawning by absolute path without closing fds lets subprocess use
+        # posix_spawn instead of forking the whole process
+        process = subprocess.run(
+            curl_command,
+            executable=_curl_executable(),
+            close_fds=False,
+            capture_output=True,
+            text=True
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        return subprocess.CompletedProcess(
+            args=curl_command,
+            returncode=-1,
+            stdout="",
+            stderr=str(e)
+        )
+    if process.returncode != 0:
+        logger.error(f"Error sending message: curl exited with code {process.returncode}")
+    return process
+
+@functools.lru_cache(maxsize=32)
+def _curl_command(url, message, title, tags, priority, delay):
+    """
+    Build the curl arguments for sending a message.
+    
+    A loop sends the same message every iteration, so the arguments are
+    cached rather than rebuilt for each send.
+    
+    Returns:
+        tuple: The curl command line
+    """
+    curl_command = ["curl", "-s", url]
     
     # Add optional headers
     if title:
@@ -46,26 +206,484 @@ def send_ntfy_message(topic, message, title=None, tags=None, priority=None, dela
     
     # Add the message as data
     curl_command.extend(["-d", message])
+    return tuple(curl_command)
+
+@functools.lru_cache(maxsize=None)
+def _curl_executable():
+    """
+    Find the curl binary on PATH once per process.
     
-    try:
-        process = subprocess.run(
-            curl_command,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return process
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error sending message: {e}")
-        return e
-    except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
+    Returns:
+        str: curl's absolute path, or "curl" if it isn't on PATH
+    """
+    return shutil.which("curl") or "curl"
+
+def _message_headers(title, tags, priority, delay):
+    """
+    Build the ntfy headers for a message.
+    
+    Returns:
+        dict: Header values, sent as UTF-8 bytes as curl does
+    """
+    headers = {}
+    if title:
+        headers["Title"] = title.encode()
+    if tags:
+        headers["Tags"] = tags.encode()
+    if priority:
+        headers["Priority"] = str(priority)
+    if delay:
+        headers["Delay"] = delay.encode()
+    return headers
+
+def _request_error(url, error):
+    """
+    Log a failed request and wrap it like a failed curl run.
+    
+    Returns:
+        subprocess.CompletedProcess: A result with a non-zero return code
+    """
+    logger.error(f"Error sending message: {str(error)}")
+    return subprocess.CompletedProcess(
+        args=["POST", url],
+        returncode=-1,
+        stdout="",
+        stderr=str(error)
+    )
+
+def _response_result(url, response):
+    """
+    Wrap an ntfy.sh response like the curl run that would have produced it.
+    
+    Returns:
+        subprocess.CompletedProcess: A result with curl's --fail return code for HTTP errors
+    """
+    if response.is_error:
         return subprocess.CompletedProcess(
-            args=curl_command,
-            returncode=-1,
-            stdout="",
-            stderr=str(e)
+            args=["POST", url],
+            returncode=22,
+            stdout=response.text,
+            stderr=f"The requested URL returned error: {response.status_code}"
         )
+    
+    return subprocess.CompletedProcess(
+        args=["POST", url],
+        returncode=0,
+        stdout=response.text,
+        stderr=""
+    )
+
+def _post_message(client, topic, message, title, tags, priority, delay):
+    """
+    Send a message to ntfy.sh over a persistent HTTP connection.
+    
+    Returns:
+        subprocess.CompletedProcess: The result of the request, shaped like a curl run
+    """
+    request = client.build_request(
+        "POST",
+        f"{NTFY_SERVER}/{topic}",
+        headers=_message_headers(title, tags, priority, delay),
+        content=message.encode()
+    )
+    return _send_request(client, request)
+
+def _retry_delay(attempt):
+    """
+    Pick how long to wait before a retry, with full jitter.
+    
+    Args:
+        attempt (int): The number of retries already made
+    
+    Returns:
+        float: Seconds to wait, up to RETRY_BACKOFF * 2 ** attempt
+    """
+    return random.uniform(0, RETRY_BACKOFF * 2 ** attempt)
+
+def _retry_wait(response, attempt):
+    """
+    Pick how long to wait before retrying a send the server turned away.
+    
+    The server's Retry-After header is followed when it has one; otherwise
+    the wait backs off with jitter.
+    
+    Args:
+        response (httpx.Response): The response turning the send away
+        attempt (int): The number of retries already made
+    
+    Returns:
+        float: Seconds to wait, or None if the send shouldn't be retried
+    """
+    if attempt >= SEND_RETRIES or response.status_code not in RETRY_STATUSES:
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if not retry_after:
+        return _retry_delay(attempt)
+    try:
+        wait = float(retry_after)
+    except ValueError:
+        # Or an HTTP date
+        try:
+            wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return _retry_delay(attempt)
+    return max(0.0, wait) if wait <= RETRY_MAX_WAIT else None
+
+def _sleep(seconds):
+    """Wait without a way to be stopped, for sends made outside a loop."""
+    time.sleep(seconds)
+    return False
+
+def _send_request(client, request, wait=_sleep):
+    """
+    Send a request built with client.build_request and wrap the response.
+    
+    Responses in RETRY_STATUSES are retried up to SEND_RETRIES times.
+    
+    Args:
+        client (httpx.Client): The client to send with
+        request (httpx.Request): The request to send
+        wait (callable): Waits the given seconds before a retry, returning
+            True to give up instead, e.g. a loop's threading.Event.wait
+    
+    Returns:
+        subprocess.CompletedProcess: The result of the request, shaped like a curl run
+    """
+    url = str(request.url)
+    attempt = 0
+    while True:
+        try:
+            response = client.send(request)
+        except Exception as e:
+            return _request_error(url, e)
+        delay = _retry_wait(response, attempt)
+        if delay is None or wait(delay):
+            return _response_result(url, response)
+        attempt += 1
+
+async def _send_request_async(client, request, stop_event=None):
+    """
+    Send a request built with client.build_request without blocking the event loop.
+    
+    Responses in RETRY_STATUSES are retried up to SEND_RETRIES times.
+    
+    Args:
+        client (httpx.AsyncClient): The client to send with
+        request (httpx.Request): The request to send
+        stop_event (asyncio.Event, optional): Gives up on retrying once set
+    
+    Returns:
+        subprocess.CompletedProcess: The result of the request, shaped like a curl run
+    """
+    url = str(request.url)
+    attempt = 0
+    while True:
+        try:
+            response = await client.send(request)
+        except Exception as e:
+            return _request_error(url, e)
+        delay = _retry_wait(response, attempt)
+        if delay is None:
+            return _response_result(url, response)
+        if stop_event is None:
+            await asyncio.sleep(delay)
+        else:
+            try:
+                await asyncio.wait_for(stop_event.wait(), delay)
+                return _response_result(url, response)
+            except asyncio.TimeoutError:
+                pass
+        attempt += 1
+
+async def send_ntfy_message_async(client, topic, message, title=None, tags=None, priority=None, delay=None):
+    """
+    Send a message to ntfy.sh without blocking the event loop.
+    
+    Args:
+        client (httpx.AsyncClient): The client to send with
+        topic (str): The ntfy topic to send to
+        message (str): The message to send
+        title (str, optional): Title of the notification
+        tags (str, optional): Comma-separated list of tags (e.g., "warning,skull")
+        priority (int, optional): Priority level (1-5)
+        delay (str, optional): Delivery delay (e.g., "10m", "1h")
+    
+    Returns:
+        subprocess.CompletedProcess: The result of the request, shaped like a curl run
+    """
+    request = client.build_request(
+        "POST",
+        f"{NTFY_SERVER}/{topic}",
+        headers=_message_headers(title, tags, priority, delay),
+        content=message.encode()
+    )
+    return await _send_request_async(client, request)
+
+def build_raw_request(topic, message, title=None, tags=None, priority=None, delay=None):
+    """
+    Serialize a publish request as raw HTTP/1.1 bytes.
+    
+    Args:
+        topic (str): The ntfy topic to send to
+        message (str): The message to send
+        title (str, optional): Title of the notification
+        tags (str, optional): Comma-separated list of tags (e.g., "warning,skull")
+        priority (int, optional): Priority level (1-5)
+        delay (str, optional): Delivery delay (e.g., "10m", "1h")
+    
+    Returns:
+        bytes: The complete request, ready to be written to the connection
+    """
+    server = urlsplit(NTFY_SERVER)
+    body = message.encode()
+    
+    lines = [
+        f"POST {server.path.rstrip('/')}/{topic} HTTP/1.1".encode(),
+        f"Host: {server.netloc}".encode(),
+        f"Content-Length: {len(body)}".encode(),
+    ]
+    for name, value in _message_headers(title, tags, priority, delay).items():
+        if isinstance(value, str):
+            value = value.encode()
+        # Line breaks would end the header early and corrupt the pipeline
+        value = value.replace(b"\r", b" ").replace(b"\n", b" ")
+        lines.append(name.encode() + b": " + value)
+    
+    return b"\r\n".join(lines) + b"\r\n\r\n" + body
+
+class PipelinedConnection:
+    """
+    A single HTTP/1.1 connection to the ntfy server that pipelines requests.
+    
+    A whole batch of requests is written to the socket in one go and the
+    responses are read back in order afterwards, so a batch costs one write
+    instead of one request/response round trip per message. This is as far
+    as submission batching goes without kernel-side polling (io_uring
+    SQPOLL), which Python cannot drive over a TLS socket.
+    
+    At most `window` requests are in flight at once. Larger batches are
+    written in slices as responses come back, so neither side ends up blocked
+    on a full socket buffer waiting for the other to read.
+    """
+    
+    def __init__(self, timeout: float = 10.0, window: int = 64):
+        """
+        Initialize the connection; it is opened on first use.
+        
+        Args:
+            timeout: Socket timeout in seconds for connecting and reading responses.
+            window: Maximum number of requests written ahead of their responses.
+        """
+        self.timeout = timeout
+        self.window = max(1, window)
+        self._sock = None
+        self._reader = None
+    
+    def connect(self):
+        """Open the TCP (and TLS, for https) connection to the ntfy server."""
+        server = urlsplit(NTFY_SERVER)
+        port = server.port or (443 if server.scheme == "https" else 80)
+        
+        sock = socket.create_connection((server.hostname, port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if server.scheme == "https":
+            context = ssl.create_default_context()
+            context.set_alpn_protocols(["http/1.1"])
+            sock = context.wrap_socket(sock, server_hostname=server.hostname)
+        
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+    
+    def close(self):
+        """Close the connection."""
+        if self._reader is not None:
+            self._reader.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+        self._reader = None
+    
+    def send_batch(self, request: bytes, count: int) -> List[subprocess.CompletedProcess]:
+        """
+        Send the same request `count` times and collect the responses.
+        
+        Publishing isn't idempotent, so requests are never silently resent.
+        If the server ends the connection with "Connection: close", it hasn't
+        processed the requests after that response, and they are left out of
+        the results for the caller to send again. If the connection fails any
+        other way, the server may or may not have processed the requests still
+        in flight, and they are reported as failures.
+        
+        Args:
+            request: The raw request from build_raw_request.
+            count: Number of times to send it.
+        
+        Returns:
+            One result per request that was answered or may have been
+            processed, in order, shaped like a curl run. Requests beyond these
+            were never processed and are safe to send again.
+        """
+        if self._sock is None:
+            self.connect()
+        
+        results = []
+        sent = 0
+        try:
+            while len(results) < count and self._sock is not None:
+                # Top the pipeline back up once half of the window has been answered
+                in_flight = sent - len(results)
+                if sent < count and in_flight <= self.window // 2:
+                    n = min(self.window - in_flight, count - sent)
+                    # Count the requests before writing, since a failed write
+                    # may still have delivered some of them
+                    sent += n
+                    self._sock.sendall(request * n)
+                results.append(self._read_response())
+        except (OSError, ValueError, IndexError) as e:
+            logger.debug(f"Pipelined connection failed after {len(results)} responses: {e}")
+            self.close()
+            results.extend(
+                subprocess.CompletedProcess(
+                    args=["POST", NTFY_SERVER],
+                    returncode=-1,
+                    stdout="",
+                    stderr=f"Connection lost before the server answered: {e}"
+                )
+                for _ in range(sent - len(results))
+            )
+        
+        if len(results) < count:
+            self.close()
+        return results
+    
+    def _read_response(self) -> subprocess.CompletedProcess:
+        """
+        Read the next pipelined response from the connection.
+        
+        Returns:
+            The result, shaped like a curl run.
+        """
+        status_line = self._reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+        status = int(status_line.split()[1])
+        
+        headers = {}
+        while True:
+            line = self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self._reader.readline().split(b";")[0], 16)
+                if size == 0:
+                    # Skip any trailers up to the terminating blank line
+                    while self._reader.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(self._reader.read(size))
+                self._reader.readline()
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = self._reader.read(int(headers["content-length"]))
+        else:
+            body = self._reader.read()
+        
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        
+        result = subprocess.CompletedProcess(
+            args=["POST", NTFY_SERVER],
+            returncode=0,
+            stdout=body.decode(errors="replace"),
+            stderr=""
+        )
+        if status >= 400:
+            result.returncode = 22
+            result.stderr = f"The requested URL returned error: {status}"
+        return result
+
+def run_event_loop(coro):
+    """
+    Run a coroutine to completion, on uvloop when it is installed.
+    
+    Args:
+        coro: The coroutine to run.
+    
+    Returns:
+        The coroutine's result.
+    """
+    with create_runner() as runner:
+        return runner.run(coro)
+
+def create_runner():
+    """
+    Create an asyncio runner, on uvloop when it is installed.
+    
+    A runner keeps its event loop open between runs, so clients created for
+    it can keep their connections across several runs.
+    
+    Returns:
+        asyncio.Runner: The runner, to be used as a context manager
+    """
+    # uvloop waits inside libuv, where gevent can't switch to other greenlets,
+    # so under gevent (e.g. gunicorn's gevent worker) use the stdlib loop,
+    # whose selector gevent makes cooperative
+    use_uvloop = uvloop is not None and not _gevent_patched()
+    return asyncio.Runner(loop_factory=uvloop.new_event_loop if use_uvloop else None)
+
+def _gevent_patched():
+    """
+    Check whether gevent has monkey-patched the standard library.
+    
+    Returns:
+        bool: True if sockets are patched to cooperate with gevent
+    """
+    monkey = sys.modules.get("gevent.monkey")
+    return monkey is not None and monkey.is_module_patched("socket")
+
+def send_ntfy_batch(messages):
+    """
+    Send several messages at once.
+    
+    The messages go out as concurrent requests on one connection, which HTTP/2
+    multiplexes as parallel streams, so the connection setup is paid once
+    however many messages there are.
+    
+    Args:
+        messages (list): One dict of send_ntfy_message arguments (topic, message,
+            and optionally title, tags, priority, delay) per message
+    
+    Returns:
+        list: One subprocess.CompletedProcess per message, in order
+    """
+    if httpx is None:
+        return [send_ntfy_message(**kwargs) for kwargs in messages]
+    
+    async def send_all():
+        async with create_async_client(len(messages)) as client:
+            return await send_ntfy_batch_async(client, messages)
+    
+    return run_event_loop(send_all())
+
+async def send_ntfy_batch_async(client, messages):
+    """
+    Send several messages at once over an existing client.
+    
+    Args:
+        client (httpx.AsyncClient): The client to send with
+        messages (list): One dict of send_ntfy_message arguments per message
+    
+    Returns:
+        list: One subprocess.CompletedProcess per message, in order
+    """
+    return await asyncio.gather(*[
+        send_ntfy_message_async(client, **kwargs) for kwargs in messages
+    ])
 
 class NtfyLooper:
     """A class to send ntfy.sh messages in a loop with configurable parameters."""
@@ -79,12 +697,17 @@ class NtfyLooper:
                  delay: Optional[str] = None,
                  interval: float = 300.0,
                  max_iterations: Optional[int] = None,
-                 verbose: bool = False):
+                 verbose: bool = False,
+                 client=None,
+                 backend: str = "http",
+                 batch_size: int = 32,
+                 handle_signals: bool = True):
         """
         Initialize the NtfyLooper with the specified parameters.
         
         Args:
-            topic: The ntfy.sh topic to send to.
+            topic: The ntfy.sh topic to send to, or several comma-separated
+                topics to send every message to at once.
             message: The message content to send.
             title: Optional title for the notification.
             tags: Optional comma-separated tags for the notification.
@@ -93,52 +716,122 @@ class NtfyLooper:
             interval: Time to wait between messages in seconds.
             max_iterations: Maximum number of messages to send, or None for infinite.
             verbose: If True, display detailed output.
+            client: Optional httpx.Client to send with; one is created for the loop otherwise.
+            backend: "http" to send each message with the HTTP client, "pipeline"
+                to write batches of messages to one connection at once, or
+                "schedule" to send every message at once, each delayed on the
+                server until its time.
+            batch_size: Number of messages per batch with the "pipeline" backend.
+            handle_signals: If True, stop the loop on SIGINT and SIGTERM. Loops run
+                inside a server leave the server's own handlers in place.
         """
         self.topic = topic
+        self.topics = [t.strip() for t in topic.split(",") if t.strip()] or [topic]
         self.message = message
         self.title = title
         self.tags = tags
         self.priority = priority
         self.delay = delay
+        # Every message has the same headers and body, so build them once
+        self._headers = _message_headers(title, tags, priority, delay)
+        self._content = message.encode()
         self.interval = interval
         self.max_iterations = max_iterations
         self.verbose = verbose
+        self.backend = backend
+        self.batch_size = max(1, batch_size)
+        self.handle_signals = handle_signals
         self.iteration_count = 0
         self.success_count = 0
         self.failure_count = 0
         self.running = True
+        # Set by stop() so the wait between messages ends immediately
+        self._stop_event = threading.Event()
+        # Wakes run_async's waits the same way while it is running
+        self._wake_async = None
         
-        # Set up signal handling for graceful termination
-        signal.signal(signal.SIGINT, self._handle_signal)
-        signal.signal(signal.SIGTERM, self._handle_signal)
+        # Send every message of the loop over one keep-alive connection
+        self._owns_client = client is None and httpx is not None
+        self._client = client or (create_client() if httpx else None)
+        
+        # Set up signal handling for graceful termination. Handlers can only be
+        # installed from the main thread; a looper created in another thread
+        # is stopped with stop() instead.
+        if handle_signals and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self._handle_signal)
+            signal.signal(signal.SIGTERM, self._handle_signal)
         
     def _handle_signal(self, signum, frame):
-        """Handle termination signals by setting running flag to False."""
+        """Handle termination signals by stopping the loop."""
         logger.info(f"Received signal {signum}, stopping after current iteration...")
+        # Also wakes run_async where the event loop can't take the signal itself
+        self.stop()
+    
+    def stop(self):
+        """Stop the loop after the message being sent, without waiting out the interval."""
         self.running = False
+        self._stop_event.set()
+        if self._wake_async is not None:
+            try:
+                self._wake_async()
+            except RuntimeError:
+                # The event loop has already finished
+                pass
+    
+    def _has_next(self) -> bool:
+        """Return whether another send follows the one just made, so there is an interval to wait."""
+        return self.running and (self.max_iterations is None or self.iteration_count < self.max_iterations)
     
-    def log_result(self, result):
+    def _wait_for_next(self, start: float, sent: int) -> float:
+        """
+        Wait until the next send is due, or until the loop is stopped.
+        
+        Sends are scheduled from the start of the loop on the monotonic clock,
+        so the time spent sending doesn't add up over the loop. A send that
+        overran its interval moves the schedule back instead of being caught
+        up with a burst of sends.
+        
+        Args:
+            start: The monotonic time the schedule counts from.
+            sent: The number of sends done so far.
+        
+        Returns:
+            The time to count the remaining sends from.
+        """
+        remaining = start + sent * self.interval - time.monotonic()
+        if remaining > 0:
+            self._stop_event.wait(remaining)
+            return start
+        return start - remaining
+    
+    def log_result(self, result, iteration: Optional[int] = None, topic: Optional[str] = None):
         """
         Log the result of a message send.
         
         Args:
-            result: The subprocess.CompletedProcess or subprocess.CalledProcessError.
+            result: The subprocess.CompletedProcess of the send.
+            iteration: The message number the result belongs to, defaulting to the current one.
+            topic: The topic the message was sent to, defaulting to the only one.
         """
+        if iteration is None:
+            iteration = self.iteration_count
+        
         if result.returncode == 0:
             self.success_count += 1
-            logger.info(f"Message {self.iteration_count}: Successfully sent to ntfy.sh/{self.topic}")
-            if self.verbose:
-                logger.info(f"Response: {result.stdout.strip()}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Message %d: Successfully sent to ntfy.sh/%s", iteration, topic or self.topics[0])
+                if self.verbose:
+                    logger.info("Response: %s", result.stdout.strip())
         else:
             self.failure_count += 1
-            logger.error(f"Message {self.iteration_count}: Failed with code {result.returncode}")
-            logger.error(f"Error: {result.stderr.strip()}")
-            if self.verbose and hasattr(result, 'stdout') and result.stdout:
-                logger.info(f"Response: {result.stdout.strip()}")
+            logger.error("Message %d: Failed with code %d", iteration, result.returncode)
+            logger.error("Error: %s", result.stderr.strip())
+            if self.verbose and hasattr(result, 'stdout') and result.stdout and logger.isEnabledFor(logging.INFO):
+                logger.info("Response: %s", result.stdout.strip())
     
-    def run(self):
-        """Run the ntfy sender in a loop according to the configuration."""
-        logger.info(f"Starting ntfy loop to topic: {self.topic}")
+    def _log_start(self):
+        """Log the loop configuration before the first message."""
+        logger.info(f"Starting ntfy loop to topic: {', '.join(self.topics)}")
         logger.info(f"Message: {self.message}")
         if self.title:
             logger.info(f"Title: {self.title}")
@@ -149,15 +842,173 @@ class NtfyLooper:
         if self.delay:
             logger.info(f"Delay: {self.delay}")
         logger.info(f"Interval: {self.interval} seconds")
+        if self.backend == "pipeline":
+            logger.info(f"Pipelining {self.batch_size} messages per batch")
+        elif self.backend == "schedule":
+            logger.info("Scheduling the messages for delivery by the server")
         
         if self.max_iterations:
             logger.info(f"Maximum messages: {self.max_iterations}")
         else:
             logger.info("Running indefinitely. Press Ctrl+C to stop.")
+    
+    def _log_summary(self, duration: float):
+        """
+        Log the summary statistics of the run.
+        
+        Args:
+            duration: Total execution time in seconds.
+        """
+        logger.info("\nExecution Summary:")
+        sent = self.success_count + self.failure_count
+        logger.info(f"Total messages sent: {sent}")
+        logger.info(f"Successful messages: {self.success_count}")
+        logger.info(f"Failed messages: {self.failure_count}")
+        logger.info(f"Total execution time: {duration:.2f} seconds")
+        if sent > 0:
+            logger.info(f"Success rate: {self.success_count / sent * 100:.2f}%")
+    
+    def _run_pipelined(self) -> bool:
+        """
+        Send the messages in pipelined batches over a single connection.
+        
+        Each batch of `batch_size` messages is written to the connection at
+        once, and the interval is waited between batches.
+        
+        Returns:
+            False if the pipelined connection could not be used, so the caller
+            can send the remaining messages with the regular HTTP client.
+        """
+        request = build_raw_request(
+            self.topics[0],
+            self.message,
+            self.title,
+            self.tags,
+            self.priority,
+            self.delay
+        )
+        connection = PipelinedConnection()
+        
+        try:
+            connection.connect()
+        except Exception as e:
+            logger.warning(f"Could not open pipelined connection ({e}), using the HTTP client instead")
+            return False
+        
+        try:
+            schedule = time.monotonic()
+            batches = 0
+            while self.running:
+                count = self.batch_size
+                if self.max_iterations:
+                    count = min(count, self.max_iterations - self.iteration_count)
+                    if count <= 0:
+                        logger.info(f"Reached maximum iterations ({self.max_iterations}), stopping.")
+                        break
+                
+                results = connection.send_batch(request, count)
+                for result in results:
+                    self.iteration_count += 1
+                    self.log_result(result)
+                
+                if len(results) < count:
+                    # The server closed the connection part-way through the batch
+                    # without processing the rest. Reconnect and send them, or
+                    # hand them to the HTTP client if the connection makes no
+                    # progress at all.
+                    if results:
+                        try:
+                            connection.connect()
+                            continue
+                        except Exception as e:
+                            logger.debug(f"Reconnecting the pipelined connection failed: {e}")
+                    logger.warning(
+                        "Pipelined connection lost, sending the remaining messages with the HTTP client"
+                    )
+                    return False
+                
+                # Wait for the specified interval before the next batch
+                batches += 1
+                if self._has_next():
+                    schedule = self._wait_for_next(schedule, batches)
+        finally:
+            connection.close()
+        
+        return True
+    
+    def _run_scheduled(self) -> bool:
+        """
+        Send every message right away, each delayed on the server until its time.
+        
+        Message i is published with a Delay of i intervals from the start, so
+        ntfy.sh delivers the loop on schedule without this process waiting
+        out the intervals. stop() and Ctrl+C only stop the messages not yet
+        sent; those already scheduled on the server are still delivered.
+        
+        Returns:
+            False if the loop can't be scheduled on the server, so the caller
+            can send the messages itself instead.
+        """
+        if self._client is None or not self.max_iterations or self.delay:
+            logger.warning("Only a set number of messages without a delay can be scheduled, sending them in a loop instead")
+            return False
+        if self.max_iterations > 1 and not (
+            SCHEDULE_MIN_DELAY <= self.interval
+            and (self.max_iterations - 1) * self.interval <= SCHEDULE_MAX_DELAY
+        ):
+            logger.warning(
+                f"The server only delays messages by {SCHEDULE_MIN_DELAY} seconds to "
+                f"{SCHEDULE_MAX_DELAY // 3600} hours, sending them in a loop instead"
+            )
+            return False
         
-        start_time = datetime.now()
+        # Delays are given as times, so they don't shift with the time it takes to send
+        start = time.time()
+        headers = dict(self._headers)
+        while self.running and self.iteration_count < self.max_iterations:
+            due = start + self.iteration_count * self.interval
+            self.iteration_count += 1
+            for topic in self.topics:
+                if self.iteration_count > 1:
+                    # Earlier sends, and their retries, may have used up some
+                    # of the delay. The server rejects anything under its
+                    # minimum, so keep a second's headroom for the request to
+                    # reach it.
+                    earliest = time.time() + SCHEDULE_MIN_DELAY + 1
+                    headers["Delay"] = str(math.ceil(max(due, earliest)))
+                request = self._client.build_request(
+                    "POST",
+                    f"{NTFY_SERVER}/{topic}",
+                    headers=headers,
+                    content=self._content
+                )
+                self.log_result(_send_request(self._client, request, self._stop_event.wait), topic=topic)
+        return True
+    
+    def run(self):
+        """Run the ntfy sender in a loop according to the configuration."""
+        if (len(self.topics) > 1 and self.backend != "schedule"
+                and httpx is not None and not _gevent_patched()):
+            # Fan every message out to all topics at once over one connection.
+            # Under gevent an event loop would be shared by every greenlet in
+            # the thread, so the topics are sent one after another instead.
+            run_event_loop(self.run_async())
+            return
+        
+        self._log_start()
+        
+        start_time = time.monotonic()
         
         try:
+            if self.backend == "pipeline" and len(self.topics) == 1 and self._run_pipelined():
+                return
+            if self.backend == "schedule" and self._run_scheduled():
+                return
+            
+            # Every iteration sends the same messages, so build the requests once
+            requests = self._build_requests(self._client) if self._client is not None else []
+            
+            schedule = time.monotonic()
             while self.running:
                 self.iteration_count += 1
                 
@@ -167,33 +1018,317 @@ class NtfyLooper:
                     break
                 
                 # Send the ntfy message and log the result
-                result = send_ntfy_message(
-                    self.topic,
-                    self.message,
-                    self.title,
-                    self.tags,
-                    self.priority,
-                    self.delay
-                )
-                
-                self.log_result(result)
+                if requests:
+                    for topic, request in requests:
+                        self.log_result(_send_request(self._client, request, self._stop_event.wait), topic=topic)
+                else:
+                    for topic in self.topics:
+                        result = send_ntfy_message(
+                            topic,
+                            self.message,
+                            self.title,
+                            self.tags,
+                            self.priority,
+                            self.delay
+                        )
+                        self.log_result(result, topic=topic)
                 
                 # Wait for the specified interval before the next iteration
-                if self.running and (self.max_iterations is None or self.iteration_count < self.max_iterations):
-                    time.sleep(self.interval)
+                if self._has_next():
+                    schedule = self._wait_for_next(schedule, self.iteration_count)
                     
         finally:
+            if self._owns_client:
+                self._client.close()
+            
             # Print summary statistics
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            self._log_summary(time.monotonic() - start_time)
+    
+    def _build_requests(self, client):
+        """
+        Build the request for each topic, to be sent again every iteration.
+        
+        Args:
+            client: The httpx.Client or httpx.AsyncClient the requests are sent with.
+        
+        Returns:
+            A list of (topic, httpx.Request) pairs.
+        """
+        return [
+            (topic, client.build_request(
+                "POST",
+                f"{NTFY_SERVER}/{topic}",
+                headers=self._headers,
+                content=self._content
+            ))
+            for topic in self.topics
+        ]
+    
+    async def _send_async(self, client, requests, iteration: int, semaphore: asyncio.Semaphore,
+                          stop_event: asyncio.Event):
+        """
+        Send one message to every topic on the event loop and log the results.
+        
+        With several topics the sends run concurrently, as parallel streams
+        on the client's HTTP/2 connection.
+        
+        Args:
+            client: The shared httpx.AsyncClient.
+            requests: The (topic, request) pairs from _build_requests.
+            iteration: The message number being sent.
+            semaphore: The in-flight slot held for this message, released when done.
+            stop_event: Set when the loop stops, ending any retries.
+        """
+        try:
+            results = await asyncio.gather(*[
+                _send_request_async(client, request, stop_event) for _, request in requests
+            ])
+            for (topic, _), result in zip(requests, results):
+                self.log_result(result, iteration, topic)
+        finally:
+            semaphore.release()
+    
+    async def run_async(self):
+        """
+        Run the ntfy sender on asyncio, multiplexing messages over one connection.
+        
+        A message is dispatched every interval without waiting for the previous
+        response, so in-flight messages share a single HTTP/2 connection instead
+        of each waiting out a full round trip.
+        """
+        if httpx is None:
+            # Without an async client there is nothing to multiplex over
+            self.run()
+            return
+        
+        self._log_start()
+        
+        loop = asyncio.get_running_loop()
+        stop_event = asyncio.Event()
+        
+        def handle_signal(signum):
+            logger.info(f"Received signal {signum}, stopping after the messages in flight...")
+            self.running = False
+            stop_event.set()
+        
+        # Wake the loop immediately on Ctrl+C instead of after the current wait
+        signals = []
+        for signum in (signal.SIGINT, signal.SIGTERM) if self.handle_signals else ():
+            try:
+                loop.add_signal_handler(signum, handle_signal, signum)
+                signals.append(signum)
+            except (NotImplementedError, RuntimeError):
+                # Not supported on this platform or outside the main thread
+                pass
+        # stop() may be called from another thread, e.g. by stream()
+        self._wake_async = lambda: loop.call_soon_threadsafe(stop_event.set)
+        
+        start_time = time.monotonic()
+        start = loop.time()
+        semaphore = asyncio.Semaphore(ASYNC_MAX_IN_FLIGHT)
+        in_flight = set()
+        
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=1),
+            timeout=10.0
+        )
+        requests = self._build_requests(client)
+        
+        try:
+            while self.running:
+                # Check if we've reached the maximum number of iterations
+                if self.max_iterations and self.iteration_count >= self.max_iterations:
+                    logger.info(f"Reached maximum iterations ({self.max_iterations}), stopping.")
+                    break
+                
+                # Message i goes out i intervals after the start
+                wait = start + self.iteration_count * self.interval - loop.time()
+                if wait > 0:
+                    # Wait for the message's time, waking early if a stop was requested
+                    try:
+                        await asyncio.wait_for(stop_event.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    # Let the sends and the signal handlers run, even when
+                    # every message is already due
+                    await asyncio.sleep(0)
+                if not self.running:
+                    break
+                
+                # Wait for a free slot, but give up as soon as a stop is requested
+                acquire = asyncio.ensure_future(semaphore.acquire())
+                stop = asyncio.ensure_future(stop_event.wait())
+                await asyncio.wait((acquire, stop), return_when=asyncio.FIRST_COMPLETED)
+                stop.cancel()
+                if not acquire.done():
+                    acquire.cancel()
+                    break
+                if not self.running:
+                    semaphore.release()
+                    break
+                
+                self.iteration_count += 1
+                task = asyncio.create_task(
+                    self._send_async(client, requests, self.iteration_count, semaphore, stop_event)
+                )
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            
+            if in_flight:
+                await asyncio.gather(*in_flight)
+                
+        finally:
+            self._wake_async = None
+            await client.aclose()
+            if self._owns_client:
+                self._client.close()
+            
+            for signum in signals:
+                loop.remove_signal_handler(signum)
+                signal.signal(signum, self._handle_signal)
             
-            logger.info("\nExecution Summary:")
-            logger.info(f"Total messages sent: {self.iteration_count}")
-            logger.info(f"Successful messages: {self.success_count}")
-            logger.info(f"Failed messages: {self.failure_count}")
-            logger.info(f"Total execution time: {duration:.2f} seconds")
-            if self.iteration_count > 0:
-                logger.info(f"Success rate: {self.success_count / self.iteration_count * 100:.2f}%")
+            # Print summary statistics
+            self._log_summary(time.monotonic() - start_time)
+
+class _ThreadLog(logging.Handler):
+    """A logging handler passing the lines logged by the thread that created it to a callback."""
+    
+    def __init__(self, callback):
+        super().__init__()
+        self._callback = callback
+        self._thread = threading.get_ident()
+        self.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+    
+    def emit(self, record):
+        # Loops running at the same time in other threads keep their own lines
+        if record.thread == self._thread:
+            self._callback(self.format(record))
+
+def run(topic: str,
+        message: str,
+        title: Optional[str] = None,
+        tags: Optional[str] = None,
+        interval: float = 300.0,
+        iterations: Optional[int] = None,
+        priority: Optional[int] = None,
+        verbose: bool = False,
+        delay: Optional[str] = None,
+        max_lines: Optional[int] = None) -> subprocess.CompletedProcess:
+    """
+    Run a loop in-process and return its log output and outcome.
+    
+    This is the library counterpart of running the script: the loop is the
+    same, but it runs in the calling thread and leaves signal handling to
+    the caller.
+    
+    Args:
+        topic: The ntfy.sh topic to send to, or several comma-separated topics.
+        message: The message content to send.
+        title: Optional title for the notification.
+        tags: Optional comma-separated tags for the notification.
+        interval: Time to wait between messages in seconds.
+        iterations: Maximum number of messages to send, or None for infinite.
+        priority: Optional priority level (1-5).
+        verbose: If True, include the response bodies in the output.
+        delay: Optional delivery delay (e.g., "10m").
+        max_lines: Keep only this many of the last output lines, or None for all.
+    
+    Returns:
+        A subprocess.CompletedProcess with the loop's log lines, as the script
+        would print them, as stdout and a returncode of 1 if any of its
+        messages failed.
+    """
+    lines = collections.deque(maxlen=max_lines)
+    handler = _ThreadLog(lines.append)
+    logger.addHandler(handler)
+    try:
+        looper = NtfyLooper(
+            topic=topic,
+            message=message,
+            title=title,
+            tags=tags,
+            priority=priority,
+            delay=delay,
+            interval=interval,
+            max_iterations=iterations,
+            verbose=verbose,
+            client=_CLIENT,
+            handle_signals=False
+        )
+        looper.run()
+    finally:
+        logger.removeHandler(handler)
+    return subprocess.CompletedProcess(
+        args=[],
+        returncode=1 if looper.failure_count else 0,
+        stdout="".join(f"{line}\n" for line in lines),
+        stderr=""
+    )
+
+def stream(topic: str,
+           message: str,
+           title: Optional[str] = None,
+           tags: Optional[str] = None,
+           interval: float = 300.0,
+           iterations: Optional[int] = None,
+           priority: Optional[int] = None,
+           verbose: bool = False,
+           delay: Optional[str] = None):
+    """
+    Run a loop in a background thread and yield its log lines as they are logged.
+    
+    Closing the generator, e.g. when the client reading the lines goes away,
+    stops the loop.
+    
+    Args:
+        topic: The ntfy.sh topic to send to, or several comma-separated topics.
+        message: The message content to send.
+        title: Optional title for the notification.
+        tags: Optional comma-separated tags for the notification.
+        interval: Time to wait between messages in seconds.
+        iterations: Maximum number of messages to send, or None for infinite.
+        priority: Optional priority level (1-5).
+        verbose: If True, include the response bodies in the output.
+        delay: Optional delivery delay (e.g., "10m").
+    
+    Yields:
+        str: Each log line of the loop, without the line break.
+    """
+    looper = NtfyLooper(
+        topic=topic,
+        message=message,
+        title=title,
+        tags=tags,
+        priority=priority,
+        delay=delay,
+        interval=interval,
+        max_iterations=iterations,
+        verbose=verbose,
+        client=_CLIENT,
+        handle_signals=False
+    )
+    lines = queue.Queue()
+    
+    def run_loop():
+        handler = _ThreadLog(lines.put)
+        logger.addHandler(handler)
+        try:
+            looper.run()
+        except Exception:
+            logger.exception("The loop failed")
+        finally:
+            logger.removeHandler(handler)
+            # Tell the reader there are no more lines
+            lines.put(None)
+    
+    threading.Thread(target=run_loop, daemon=True).start()
+    try:
+        while (line := lines.get()) is not None:
+            yield line
+    finally:
+        looper.stop()
 
 def parse_arguments():
     """
@@ -210,7 +1345,7 @@ def parse_arguments():
     parser.add_argument(
         "--topic",
         default="my_test",
-        help="The ntfy.sh topic to send to. Default is 'my_test'."
+        help="The ntfy.sh topic to send to, or several comma-separated topics to send every message to. Default is 'my_test'."
     )
     
     parser.add_argument(
@@ -260,6 +1395,20 @@ def parse_arguments():
         help="Display detailed output including response body."
     )
     
+    parser.add_argument(
+        "--backend",
+        choices=["http", "pipeline", "schedule"],
+        default="http",
+        help="'http' sends each message with the HTTP client; 'pipeline' writes batches of messages to one connection at once, waiting the interval between batches; 'schedule' sends all --iterations messages at once, each delayed by ntfy.sh until its time; stopping doesn't cancel messages already scheduled."
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=32,
+        help="Number of messages per batch with the pipeline backend."
+    )
+    
     parser.add_argument(
         "--log-level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
@@ -286,7 +1435,9 @@ def main():
         delay=args.delay,
         interval=args.interval,
         max_iterations=args.iterations,
-        verbose=args.verbose
+        verbose=args.verbose,
+        backend=args.backend,
+        batch_size=args.batch_size
     )
     
     looper.run()
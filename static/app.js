@@ -0,0 +1,274 @@
+// Store active NTFY loops, keyed by task id
+const ntfyTasks = new Map();
+let nextTaskId = 1;
+
+// Function to update the task table
+function updateTaskTable() {
+    const tableBody = document.getElementById('ntfy-tasks-body');
+    const emptyRow = tableBody.querySelector('.empty-row');
+    const rowTemplate = document.getElementById('ntfy-task-row').content.firstElementChild;
+
+    // Show/hide empty row message
+    emptyRow.style.display = ntfyTasks.size === 0 ? 'table-row' : 'none';
+
+    // Build the rows off-document from the row template and swap them
+    // in with a single DOM update
+    const fragment = document.createDocumentFragment();
+    fragment.appendChild(emptyRow);
+    for (const task of ntfyTasks.values()) {
+        const row = rowTemplate.cloneNode(true);
+        row.dataset.taskId = task.id;
+
+        const cells = row.cells;
+        cells[0].textContent = task.title;
+        cells[1].textContent = task.topic;
+        cells[2].textContent = task.priority;
+        cells[3].textContent = task.intervalDisplay;
+        cells[4].textContent = task.isInfinite ? '∞' : calculateTimeLeft(task, Date.now());
+        // Keep the cell so the countdown can update it without a DOM query
+        task.timeLeftCell = cells[4];
+        cells[5].firstElementChild.onclick = function() { deleteTask(task.id); };
+
+        fragment.appendChild(row);
+    }
+    tableBody.replaceChildren(fragment);
+    startCountdown();
+}
+
+// Function to calculate time left display
+function calculateTimeLeft(task, now) {
+    if (!task.nextRunTime) return 'Pending';
+
+    const diff = Math.max(0, Math.floor((task.nextRunTime - now) / 1000));
+
+    if (diff === 0) return 'Now';
+
+    const minutes = Math.floor(diff / 60);
+    const seconds = diff % 60;
+
+    if (minutes > 0) {
+        return `${minutes}m ${seconds}s`;
+    } else {
+        return `${seconds}s`;
+    }
+}
+
+// Function to delete a task
+function deleteTask(taskId) {
+    const task = ntfyTasks.get(taskId);
+    if (task) {
+        // Remove from the map; the scheduler drops it when it comes up
+        ntfyTasks.delete(taskId);
+        // Update the table
+        updateTaskTable();
+    }
+}
+
+// Countdown updates are timed to the next change of a displayed
+// second and stop entirely while no countdown is shown
+let countdownTimer = null;
+let countdownFrame = null;
+
+function tick() {
+    countdownFrame = null;
+    const now = Date.now();
+    let wake = Infinity;
+    for (const task of ntfyTasks.values()) {
+        if (!task.isInfinite && task.timeLeftCell) {
+            const text = calculateTimeLeft(task, now);
+            // Only touch the DOM when the displayed value changes
+            if (task.timeLeftCell.textContent !== text) {
+                task.timeLeftCell.textContent = text;
+            }
+            const left = task.nextRunTime - now;
+            if (left > 0) wake = Math.min(wake, left % 1000 + 1);
+        }
+    }
+    if (wake !== Infinity) {
+        countdownTimer = setTimeout(function() {
+            countdownTimer = null;
+            countdownFrame = requestAnimationFrame(tick);
+        }, wake);
+    }
+}
+
+function startCountdown() {
+    clearTimeout(countdownTimer);
+    cancelAnimationFrame(countdownFrame);
+    countdownTimer = null;
+    countdownFrame = requestAnimationFrame(tick);
+}
+
+// Tasks ordered by next run time in a binary min-heap, so a single
+// timer serves every task instead of one interval per task
+const runQueue = [];
+let runTimer = null;
+
+function pushRun(task) {
+    let i = runQueue.push(task) - 1;
+    while (i > 0) {
+        const parent = (i - 1) >> 1;
+        if (runQueue[parent].nextRunTime <= task.nextRunTime) break;
+        runQueue[i] = runQueue[parent];
+        i = parent;
+    }
+    runQueue[i] = task;
+}
+
+function popRun() {
+    const top = runQueue[0];
+    const last = runQueue.pop();
+    if (runQueue.length > 0) {
+        let i = 0;
+        while (true) {
+            let child = 2 * i + 1;
+            if (child >= runQueue.length) break;
+            if (child + 1 < runQueue.length && runQueue[child + 1].nextRunTime < runQueue[child].nextRunTime) {
+                child++;
+            }
+            if (runQueue[child].nextRunTime >= last.nextRunTime) break;
+            runQueue[i] = runQueue[child];
+            i = child;
+        }
+        runQueue[i] = last;
+    }
+    return top;
+}
+
+// Run every task that is due, then sleep until the next one is
+function runDueTasks() {
+    const now = Date.now();
+    while (runQueue.length > 0 && runQueue[0].nextRunTime <= now) {
+        const task = popRun();
+        if (!ntfyTasks.has(task.id)) continue;
+
+        // Here would be the actual code to send the notification
+        // For now, we'll just schedule the next run. Runs are kept on
+        // their original schedule, skipping any that were missed.
+        const interval = task.intervalMs;
+        task.nextRunTime += interval * Math.max(1, Math.ceil((now - task.nextRunTime) / interval));
+        pushRun(task);
+    }
+    scheduleRuns();
+    startCountdown();
+}
+
+function scheduleRuns() {
+    clearTimeout(runTimer);
+    runTimer = runQueue.length > 0
+        ? setTimeout(runDueTasks, Math.max(0, runQueue[0].nextRunTime - Date.now()))
+        : null;
+}
+
+// Function to add a task (will be called from the form submission)
+function addNtfyTask(taskData) {
+    // Unknown units count as seconds
+    const intervalMs = (UNIT_MS[taskData.intervalUnit] || UNIT_MS.seconds) * taskData.intervalValue;
+    const task = {
+        id: nextTaskId++,
+        title: taskData.title,
+        topic: taskData.topic,
+        message: taskData.message,
+        tags: taskData.tags,
+        priority: taskData.priority,
+        intervalValue: taskData.intervalValue,
+        intervalUnit: taskData.intervalUnit,
+        intervalDisplay: `${taskData.intervalValue} ${taskData.intervalUnit}`,
+        intervalMs: intervalMs,
+        isInfinite: taskData.isInfinite,
+        iterations: taskData.iterations,
+        nextRunTime: Date.now() + intervalMs,
+        timeLeftCell: null
+    };
+
+    // Add to the task map and the run schedule
+    ntfyTasks.set(task.id, task);
+    pushRun(task);
+    scheduleRuns();
+
+    // Update the table
+    updateTaskTable();
+}
+
+// Milliseconds per interval unit
+const UNIT_MS = {hours: 3600000, minutes: 60000, seconds: 1000};
+
+// Initialize on page load
+document.addEventListener('DOMContentLoaded', function() {
+    // Set up form submission to add a task
+    const form = document.querySelector('form[action="/run-ntfy-loop"]');
+    if (form) {
+        form.addEventListener('submit', function(e) {
+            e.preventDefault();
+
+            const formData = new FormData(form);
+            const taskData = {
+                title: formData.get('title'),
+                topic: formData.get('topic'),
+                message: formData.get('message'),
+                tags: formData.get('tags'),
+                priority: formData.get('priority'),
+                intervalValue: parseInt(formData.get('interval_value')),
+                intervalUnit: formData.get('interval_unit'),
+                isInfinite: formData.get('infinite_loop') === 'on',
+                iterations: formData.get('iterations_value')
+            };
+
+            // Add the task
+            addNtfyTask(taskData);
+
+            // Optional: Reset form or show confirmation
+            alert('NTFY loop created successfully!');
+        });
+    }
+
+    // Set up the infinite loop checkbox to disable/enable iterations input
+    const infiniteCheckbox = document.getElementById('infinite-loop');
+    const iterationsInput = document.getElementById('loop-iterations');
+    const infiniteOverlay = document.getElementById('infinite-overlay');
+    const infiniteInputContainer = document.querySelector('.infinite-input');
+
+    if (infiniteCheckbox && iterationsInput && infiniteOverlay) {
+        // Function to update the UI based on checkbox state
+        function updateInfiniteUI(checked) {
+            iterationsInput.disabled = checked;
+
+            // Handle the animation
+            if (checked) {
+                // When checked, show the infinity animation
+                iterationsInput.value = '';
+
+                // Fade out the input slightly
+                infiniteInputContainer.style.opacity = '0.4';
+
+                // Show the overlay with animation
+                setTimeout(() => {
+                    infiniteOverlay.classList.add('active');
+                }, 100);
+            } else {
+                // When unchecked, hide the infinity animation
+                iterationsInput.value = '5';
+
+                // Restore input opacity
+                infiniteInputContainer.style.opacity = '1';
+
+                // Hide the overlay with animation
+                infiniteOverlay.classList.remove('active');
+            }
+        }
+
+        // Event listener for checkbox changes
+        infiniteCheckbox.addEventListener('change', function() {
+            updateInfiniteUI(this.checked);
+        });
+
+        // Event listener for clicking on the infinity overlay
+        infiniteOverlay.addEventListener('click', function() {
+            // Uncheck the checkbox
+            infiniteCheckbox.checked = false;
+
+            // Update the UI
+            updateInfiniteUI(false);
+        });
+    }
+});
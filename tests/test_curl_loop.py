@@ -0,0 +1,187 @@
+import logging
+import signal
+import subprocess
+import time
+
+import pytest
+
+import curl_loop
+from curl_loop import _parse_arguments_fast, parse_curl_args, request_headers
+
+
+def test_parse_simple_get():
+    request = parse_curl_args(["-s", "https://example.com/"])
+    assert request["method"] == "GET"
+    assert request["url"] == "https://example.com/"
+    assert request["headers"] == []
+    assert request["content"] is None
+
+
+def test_parse_adds_default_scheme():
+    assert parse_curl_args(["example.com"])["url"] == "http://example.com"
+
+
+def test_parse_data_implies_post_form():
+    request = parse_curl_args(["-d", "a=1", "-d", "b=2", "http://x/"])
+    assert request["method"] == "POST"
+    assert request["content"] == b"a=1&b=2"
+    assert ("Content-Type", "application/x-www-form-urlencoded") in request["headers"]
+
+
+def test_parse_explicit_content_type_is_kept():
+    request = parse_curl_args(["-H", "Content-Type: application/json", "-d", "{}", "http://x/"])
+    assert request["headers"] == [("Content-Type", "application/json")]
+
+
+def test_parse_combined_short_flags_and_attached_value():
+    request = parse_curl_args(["-sSLfk", "-XPUT", "http://x/"])
+    assert request["method"] == "PUT"
+    assert request["fail"] and request["follow_redirects"]
+    assert request["verify"] is False
+
+
+def test_parse_header_set_remove_and_empty():
+    request = parse_curl_args(["-H", "X-Set: 1", "-H", "Accept:", "-H", "X-Empty;", "http://x/"])
+    assert request["headers"] == [("X-Set", "1"), ("Accept", None), ("X-Empty", "")]
+    assert request_headers(request) == [("X-Set", "1"), ("X-Empty", "")]
+
+
+def test_parse_removed_content_type_is_not_readded():
+    request = parse_curl_args(["-H", "Content-Type:", "-d", "x", "http://x/"])
+    assert request_headers(request) == []
+
+
+@pytest.mark.parametrize("args", [
+    ["-d", "@file", "http://x/"],
+    ["-H", "no-colon", "http://x/"],
+    ["--unknown", "http://x/"],
+    ["http://a/", "http://b/"],
+    ["-s"],
+    ["-m", "soon", "http://x/"],
+])
+def test_parse_unsupported_returns_none(args):
+    assert parse_curl_args(args) is None
+
+
+@pytest.mark.skipif(curl_loop.httpx is None, reason="httpx is not installed")
+def test_client_sends_curl_default_headers():
+    request = parse_curl_args(["-H", "Accept:", "http://x/"])
+    client = curl_loop.httpx.Client()
+    curl_loop.use_curl_default_headers(client, request)
+    headers = {name.lower() for name in client.headers}
+    assert client.headers["User-Agent"].startswith("curl")
+    assert "accept" not in headers
+    assert "accept-encoding" not in headers
+    assert "connection" not in headers
+    client.close()
+
+
+def test_fast_arguments():
+    args = _parse_arguments_fast(["-i", "0.5", "-n", "3", "-s", "--", "-X", "POST", "http://x/"])
+    assert args.interval == 0.5
+    assert args.iterations == 3
+    assert args.success_only is True
+    assert args.curl_command == ["-X", "POST", "http://x/"]
+
+
+def test_fast_arguments_positional_url():
+    args = _parse_arguments_fast(["http://x/", "-c", "2"])
+    assert args.curl_command == ["http://x/"]
+    assert args.concurrency == 2
+
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ["-h"],
+    ["-n", "many", "http://x/"],
+    ["-n"],
+    ["--log-level", "LOUD", "http://x/"],
+    ["-sv", "http://x/"],
+])
+def test_fast_arguments_defer_to_argparse(argv):
+    assert _parse_arguments_fast(argv) is None
+
+
+def test_loop_skips_slots_missed_during_a_stall(monkeypatch):
+    looper = curl_loop.CurlLooper(["curl", "http://x/"], interval=0.1, max_iterations=5, use_curl=True)
+    monkeypatch.setattr(looper, "_use_curl_batches", lambda: False)
+    starts = []
+
+    def execute_curl():
+        starts.append(time.monotonic())
+        if len(starts) == 1:
+            time.sleep(0.35)
+        return subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
+
+    monkeypatch.setattr(looper, "execute_curl", execute_curl)
+    looper.run()
+    gaps = [b - a for a, b in zip(starts[1:], starts[2:])]
+    assert looper.success_count == 5
+    assert min(gaps) > 0.08
+
+
+@pytest.mark.skipif(curl_loop.httpx is None, reason="httpx is not installed")
+def test_interrupted_request_is_not_counted(monkeypatch, caplog):
+    monkeypatch.setattr(curl_loop, "pycurl", None)
+    looper = curl_loop.CurlLooper(["curl", "http://x/"], interval=0, max_iterations=5, handle_signals=False)
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        if len(sent) == 3:
+            # Ctrl+C arriving while the request is in progress
+            looper._handle_signal(signal.SIGINT, None)
+        return curl_loop.httpx.Response(200)
+
+    looper._client.close()
+    looper._client = curl_loop.httpx.Client(transport=curl_loop.httpx.MockTransport(handler))
+    with caplog.at_level(logging.ERROR, logger=curl_loop.logger.name):
+        looper.run()
+    assert (looper.iteration_count, looper.success_count, looper.failure_count) == (2, 2, 0)
+    assert not caplog.records
+
+
+@pytest.mark.skipif(curl_loop.httpx is None, reason="httpx is not installed")
+def test_concurrent_loop_only_opens_an_async_client(monkeypatch):
+    monkeypatch.setattr(curl_loop, "pycurl", None)
+    httpx = curl_loop.httpx
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: async_client(transport=transport, **kwargs))
+    looper = curl_loop.CurlLooper(["curl", "http://x/"], interval=0, max_iterations=3,
+                                  concurrency=4, handle_signals=False)
+    assert looper._client is None
+    looper.run()
+    assert (looper.success_count, looper.failure_count) == (3, 0)
+
+
+@pytest.mark.skipif(curl_loop.httpx is None, reason="httpx is not installed")
+def test_client_timeout_caps_connecting_like_curl():
+    unlimited = curl_loop.client_timeout(parse_curl_args(["http://x/"]))
+    assert unlimited.read is None
+    assert unlimited.connect == curl_loop.CURL_CONNECT_TIMEOUT
+    limited = curl_loop.client_timeout(parse_curl_args(["-m", "2", "http://x/"]))
+    assert limited.read == limited.connect == 2
+
+
+def test_buffered_log_handler_flushes_on_a_timer():
+    records = []
+    target = logging.Handler()
+    target.emit = records.append
+    handler = curl_loop._BufferedLogHandler(100, flush_interval=0.05, target=target)
+    handler.handle(logging.makeLogRecord({"msg": "banner", "levelno": logging.INFO}))
+    assert records == []
+    time.sleep(0.3)
+    assert [r.msg for r in records] == ["banner"]
+    handler.close()
+
+
+def test_loops_share_one_curl_share_per_process():
+    pytest.importorskip("pycurl")
+    share = curl_loop.curl_share()
+    assert curl_loop.curl_share() is share
+    curl_loop._reset_curl_share_after_fork()
+    try:
+        assert curl_loop.curl_share() is not share
+    finally:
+        curl_loop._curl_share = share
@@ -0,0 +1,225 @@
+import gzip
+import subprocess
+import sys
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+main = pytest.importorskip("main")
+
+
+@pytest.fixture
+def client():
+    return main.app.test_client()
+
+
+def test_index_is_served_compressed(client):
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(response.data) == main._INDEX_PAGE["encodings"]["identity"]
+
+
+def test_index_identity_without_accept_encoding(client):
+    response = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.data == main._INDEX_PAGE["encodings"]["identity"]
+
+
+def test_index_etag_revalidates(client):
+    etag = client.get("/").headers["ETag"]
+    response = client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+
+
+def test_etag_differs_per_encoding(client):
+    gzip_etag = client.get("/", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    identity_etag = client.get("/", headers={"Accept-Encoding": "identity"}).headers["ETag"]
+    assert gzip_etag != identity_etag
+
+
+def test_versioned_asset_is_cached_for_good(client):
+    page = client.get("/").data.decode()
+    version = main._STATIC_ASSETS["app.js"]["etag"][:8]
+    assert f"/static/app.js?v={version}" in page
+    response = client.get(f"/static/app.js?v={version}")
+    assert response.mimetype == "text/javascript"
+    assert "immutable" in response.headers["Cache-Control"]
+
+
+def test_unversioned_asset_is_revalidated(client):
+    response = client.get("/static/app.css")
+    assert response.mimetype == "text/css"
+    assert "immutable" not in response.headers["Cache-Control"]
+    assert client.get("/static/missing.js").status_code == 404
+
+
+def test_send_failure_is_not_rendered_as_html(client, monkeypatch):
+    error = subprocess.CompletedProcess(args=[], returncode=22, stdout="", stderr="<img src=x onerror=alert(1)>")
+    future = Future()
+    future.set_result(error)
+    monkeypatch.setattr(main, "queue_notification", lambda **kwargs: future)
+    response = client.post("/send-notification", data={"topic": "t", "title": "x"})
+    assert response.status_code == 500
+    assert response.mimetype == "text/plain"
+
+
+def test_unexpected_error_shows_error_page(client, monkeypatch):
+    def queue_notification(**kwargs):
+        raise RuntimeError("<script>secret</script>")
+
+    monkeypatch.setattr(main, "queue_notification", queue_notification)
+    response = client.post("/send-notification", data={"topic": "t"})
+    assert response.status_code == 500
+    assert response.data == main._ERROR_PAGE
+
+
+def test_send_to_several_topics_queues_each(client, monkeypatch):
+    queued = []
+
+    def queue_notification(**kwargs):
+        queued.append(kwargs["topic"])
+        future = Future()
+        future.set_result(subprocess.CompletedProcess(args=[], returncode=0, stdout="{}", stderr=""))
+        return future
+
+    monkeypatch.setattr(main, "queue_notification", queue_notification)
+    response = client.post("/send-notification", data={"topic": "a, b,,c"})
+    assert response.status_code == 200
+    assert queued == ["a", "b", "c"]
+
+
+def test_ntfy_test_runs_in_process(client, monkeypatch):
+    calls = []
+
+    def ntfy_run(**kwargs):
+        calls.append(kwargs)
+        output = "2025-01-01 00:00:00 - INFO - Message 1: Successfully sent\n"
+        return subprocess.CompletedProcess(args=[], returncode=0, stdout=output, stderr="")
+
+    monkeypatch.setattr(main, "ntfy_run", ntfy_run)
+    response = client.get("/run-ntfy-test?topic=abc")
+    assert response.status_code == 200
+    assert b"Message 1: Successfully sent" in response.data
+    assert calls[0]["topic"] == "abc"
+    assert calls[0]["max_lines"] == main.OUTPUT_MAX_LINES
+
+
+def test_failed_test_run_shows_its_log(client, monkeypatch):
+    result = subprocess.CompletedProcess(args=[], returncode=1, stdout="Message 1: Failed with code 22\n", stderr="")
+    monkeypatch.setattr(main, "ntfy_run", lambda **kwargs: result)
+    response = client.get("/run-ntfy-test")
+    assert response.status_code == 500
+    assert response.mimetype == "text/plain"
+    assert b"Failed with code 22" in response.data
+
+
+def test_result_pages_escape_user_input(client, monkeypatch):
+    result = subprocess.CompletedProcess(args=[], returncode=0, stdout="<b>log</b>\n", stderr="")
+    monkeypatch.setattr(main, "ntfy_run", lambda **kwargs: result)
+    response = client.get("/run-ntfy-test")
+    assert b"<b>log</b>" not in response.data
+    assert b"&lt;b&gt;log&lt;/b&gt;" in response.data
+    response = client.get("/run-ntfy-test?topic=<script>x</script>")
+    assert response.status_code == 400
+    assert response.mimetype == "text/plain"
+
+
+def test_loop_page_streams_the_loop_output(client, monkeypatch):
+    closed = []
+
+    def ntfy_stream(**kwargs):
+        try:
+            yield "<line 1>"
+            yield "line 2"
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(main, "ntfy_stream", ntfy_stream)
+    response = client.post("/run-ntfy-loop", data={"topic": "t", "interval_value": "1", "iterations_value": "2"})
+    assert response.is_streamed
+    page = response.get_data(as_text=True)
+    assert "&lt;line 1&gt;\nline 2\n" in page
+    assert page.index("line 2") < page.index("NTFY Loop Complete!")
+    response.close()
+    assert closed == [True]
+
+
+def test_loop_limits_are_enforced(client, monkeypatch):
+    calls = []
+
+    def ntfy_stream(**kwargs):
+        calls.append(kwargs)
+        yield "done"
+
+    monkeypatch.setattr(main, "ntfy_stream", ntfy_stream)
+    client.post("/run-ntfy-loop", data={"interval_value": "1", "infinite_loop": "on"}).get_data()
+    client.post("/run-ntfy-loop", data={"interval_value": "1", "interval_unit": "hours", "iterations_value": "5000"}).get_data()
+    assert [(c["interval"], c["iterations"]) for c in calls] == [
+        (main.MIN_INTERVAL, main.MAX_ITERATIONS),
+        (main.MAX_INTERVAL, main.MAX_ITERATIONS),
+    ]
+
+
+def test_loop_interval_is_checked_in_seconds(client, monkeypatch):
+    calls = []
+
+    def ntfy_stream(**kwargs):
+        calls.append(kwargs)
+        yield "done"
+
+    monkeypatch.setattr(main, "ntfy_stream", ntfy_stream)
+    page = client.post("/run-ntfy-loop", data={"interval_value": "60", "interval_unit": "minutes"}).get_data()
+    assert calls[0]["interval"] == main.MAX_INTERVAL
+    assert f"60 minutes ({main.MAX_INTERVAL} seconds)".encode() in page
+
+
+@pytest.mark.parametrize("value, unit", [
+    ("ten", "seconds"),
+    ("10", "fortnights"),
+    ("0", "seconds"),
+    ("61", "minutes"),
+    ("2", "hours"),
+])
+def test_loop_rejects_invalid_interval(client, value, unit):
+    response = client.post("/run-ntfy-loop", data={"interval_value": value, "interval_unit": unit})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("data", [
+    {"topic": "bad topic"},
+    {"topic": "ok,bad/topic"},
+    {"topic": "ok", "tags": "new\nline"},
+    {"topic": "ok", "title": "Alert\r\nX-Injected: 1"},
+])
+def test_invalid_fields_are_rejected(client, monkeypatch, data):
+    monkeypatch.setattr(main, "queue_notification", lambda **kwargs: pytest.fail("nothing should be sent"))
+    assert client.post("/send-notification", data=data).status_code == 400
+    assert client.post("/run-ntfy-loop", data=data).status_code == 400
+
+
+def test_invalid_priority_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(main, "queue_notification", lambda **kwargs: pytest.fail("nothing should be sent"))
+    assert client.post("/send-notification", data={"priority": "9"}).status_code == 400
+
+
+def test_a_slow_send_does_not_hold_up_the_queue(monkeypatch):
+    release = threading.Event()
+
+    def send_ntfy_message(**kwargs):
+        if kwargs["topic"] == "slow":
+            release.wait(5)
+        return subprocess.CompletedProcess(args=[], returncode=0, stdout=kwargs["topic"], stderr="")
+
+    monkeypatch.setattr(main, "send_ntfy_message", send_ntfy_message)
+    try:
+        slow = main.queue_notification(topic="slow", message="hi")
+        fast = main.queue_notification(topic="fast", message="hi")
+        assert fast.result(timeout=2).stdout == "fast"
+        assert not slow.done()
+    finally:
+        release.set()
+    assert slow.result(timeout=2).stdout == "slow"
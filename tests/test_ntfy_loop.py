@@ -0,0 +1,344 @@
+import io
+import logging
+import signal
+import subprocess
+import threading
+import time
+
+import pytest
+
+import ntfy_loop
+from ntfy_loop import NtfyLooper, PipelinedConnection
+
+
+def read_responses(data, count=1):
+    connection = PipelinedConnection()
+    connection._reader = io.BytesIO(data)
+    return connection, [connection._read_response() for _ in range(count)]
+
+
+def test_read_content_length_responses_in_order():
+    data = (
+        b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+        b"HTTP/1.1 429 Too Many Requests\r\nContent-Length: 4\r\n\r\nslow"
+    )
+    _, (first, second) = read_responses(data, 2)
+    assert (first.returncode, first.stdout) == (0, "ok")
+    assert second.returncode == 22
+    assert second.stdout == "slow"
+    assert second.stderr == "The requested URL returned error: 429"
+
+
+def test_read_chunked_response_with_trailers():
+    data = (
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"3\r\nabc\r\n2;ext=1\r\nde\r\n0\r\nX-Trailer: 1\r\n\r\n"
+        b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n"
+    )
+    _, (first, second) = read_responses(data, 2)
+    assert first.stdout == "abcde"
+    assert second.stdout == ""
+
+
+def test_read_connection_close_closes():
+    data = b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 1\r\n\r\nx"
+    connection, (result,) = read_responses(data)
+    assert result.stdout == "x"
+    assert connection._reader is None
+
+
+def test_read_body_until_eof():
+    _, (result,) = read_responses(b"HTTP/1.0 200 OK\r\n\r\nrest of stream")
+    assert result.stdout == "rest of stream"
+
+
+def test_read_closed_connection_raises():
+    connection = PipelinedConnection()
+    connection._reader = io.BytesIO(b"")
+    try:
+        connection._read_response()
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError("expected ConnectionError")
+
+
+class FakeSocket:
+    def __init__(self):
+        self.written = b""
+
+    def sendall(self, data):
+        self.written += data
+
+    def close(self):
+        pass
+
+
+def pipelined(data):
+    connection = PipelinedConnection()
+    connection._sock = FakeSocket()
+    connection._reader = io.BytesIO(data)
+    return connection
+
+
+OK = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+CLOSE = b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 2\r\n\r\nok"
+
+
+def test_send_batch_leaves_unprocessed_requests_after_close():
+    results = pipelined(OK + CLOSE).send_batch(b"R", 5)
+    assert [r.returncode for r in results] == [0, 0]
+
+
+def test_send_batch_reports_requests_lost_in_flight():
+    connection = pipelined(OK)
+    results = connection.send_batch(b"R", 3)
+    assert connection._sock is None
+    assert [r.returncode for r in results] == [0, -1, -1]
+    assert "Connection lost" in results[1].stderr
+
+
+def test_looper_splits_comma_separated_topics():
+    looper = NtfyLooper("a, b,,c", "hi", client=object())
+    assert looper.topics == ["a", "b", "c"]
+    assert NtfyLooper("solo", "hi", client=object()).topics == ["solo"]
+
+
+def test_run_returns_the_loop_log_and_keeps_signal_handlers(monkeypatch, caplog):
+    caplog.set_level(logging.INFO, logger="ntfy_loop")
+    sent = []
+
+    def send_request(client, request, wait=None):
+        sent.append(str(request.url))
+        return subprocess.CompletedProcess(args=[], returncode=0, stdout="{}", stderr="")
+
+    monkeypatch.setattr(ntfy_loop, "_send_request", send_request)
+    # As under gevent, where the topics are sent from the calling greenlet
+    monkeypatch.setattr(ntfy_loop, "_gevent_patched", lambda: True)
+    handler = signal.getsignal(signal.SIGTERM)
+    result = ntfy_loop.run("a,b", "hi", interval=0, iterations=2, max_lines=3)
+    assert signal.getsignal(signal.SIGTERM) is handler
+    assert sorted(sent) == ["https://ntfy.sh/a", "https://ntfy.sh/a", "https://ntfy.sh/b", "https://ntfy.sh/b"]
+    assert result.returncode == 0
+    assert result.stdout.count("\n") == 3
+    assert "Success rate: 100.00%" in result.stdout
+
+
+def test_thread_log_ignores_other_threads(caplog):
+    caplog.set_level(logging.INFO, logger="ntfy_loop")
+    lines = []
+    handler = ntfy_loop._ThreadLog(lines.append)
+    ntfy_loop.logger.addHandler(handler)
+    try:
+        ntfy_loop.logger.info("mine")
+        thread = threading.Thread(target=ntfy_loop.logger.info, args=("theirs",))
+        thread.start()
+        thread.join()
+    finally:
+        ntfy_loop.logger.removeHandler(handler)
+    assert [line.endswith("mine") for line in lines] == [True]
+
+
+def test_closing_stream_stops_the_loop(monkeypatch, caplog):
+    caplog.set_level(logging.INFO, logger="ntfy_loop")
+    monkeypatch.setattr(
+        ntfy_loop, "_send_request",
+        lambda client, request, wait=None: subprocess.CompletedProcess(args=[], returncode=0, stdout="{}", stderr="")
+    )
+    lines = ntfy_loop.stream("a", "hi", interval=60)
+    for line in lines:
+        if "Message 1:" in line:
+            break
+    start = time.monotonic()
+    lines.close()
+    # The loop wakes from its 60 second wait and finishes right away
+    while "Total messages sent: 1" not in caplog.text and time.monotonic() - start < 5:
+        time.sleep(0.01)
+    assert time.monotonic() - start < 5
+
+
+def test_clients_retry_connecting_and_the_shared_one_has_room_for_a_batch(monkeypatch):
+    transports = []
+    transport = ntfy_loop.httpx.HTTPTransport
+
+    def record(**kwargs):
+        transports.append(kwargs)
+        return transport(**kwargs)
+
+    monkeypatch.setattr(ntfy_loop.httpx, "HTTPTransport", record)
+    ntfy_loop.create_client().close()
+    ntfy_loop._create_shared_client().close()
+    assert [kwargs["retries"] for kwargs in transports] == [ntfy_loop.CONNECT_RETRIES] * 2
+    assert transports[0]["limits"].max_connections == 4
+    assert transports[1]["limits"].max_connections == ntfy_loop.SHARED_MAX_CONNECTIONS
+
+
+def test_run_waits_out_only_what_is_left_of_each_interval(monkeypatch):
+    clock = [100.0]
+    waits = []
+
+    def send_request(client, request, wait=None):
+        clock[0] += 0.25
+        return subprocess.CompletedProcess(args=[], returncode=0, stdout="{}", stderr="")
+
+    def wait(timeout):
+        waits.append(timeout)
+        clock[0] += timeout
+
+    monkeypatch.setattr(ntfy_loop, "_send_request", send_request)
+    monkeypatch.setattr(ntfy_loop.time, "monotonic", lambda: clock[0])
+    looper = NtfyLooper("a", "hi", interval=1, max_iterations=3, handle_signals=False)
+    monkeypatch.setattr(looper._stop_event, "wait", wait)
+    looper.run()
+    assert waits == [0.75, 0.75]
+
+
+def test_stop_wakes_the_async_loop_from_its_wait(monkeypatch):
+    async def send(client, request, stop_event=None):
+        return subprocess.CompletedProcess(args=[], returncode=0, stdout="{}", stderr="")
+
+    monkeypatch.setattr(ntfy_loop, "_send_request_async", send)
+    looper = NtfyLooper("a,b", "hi", interval=60, handle_signals=False)
+    thread = threading.Thread(target=ntfy_loop.run_event_loop, args=(looper.run_async(),))
+    start = time.monotonic()
+    thread.start()
+    while looper.success_count < 2 and time.monotonic() - start < 5:
+        time.sleep(0.01)
+    looper.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert looper.success_count == 2
+
+
+def test_looper_created_off_the_main_thread_skips_signal_handlers():
+    loopers = []
+    handler = signal.getsignal(signal.SIGTERM)
+    thread = threading.Thread(target=lambda: loopers.append(NtfyLooper("a", "hi", client=object())))
+    thread.start()
+    thread.join()
+    assert loopers and signal.getsignal(signal.SIGTERM) is handler
+
+
+def test_curl_fallback_returns_failed_runs(monkeypatch):
+    failed = subprocess.CompletedProcess(args=["curl"], returncode=6, stdout="", stderr="Could not resolve host")
+    monkeypatch.setattr(ntfy_loop, "_CLIENT", None)
+    monkeypatch.setattr(ntfy_loop.subprocess, "run", lambda *args, **kwargs: failed)
+    assert ntfy_loop.send_ntfy_message("a", "hi") is failed
+
+
+def test_schedule_backend_sends_every_message_at_once_with_increasing_delays(monkeypatch):
+    delays = []
+
+    def send_request(client, request, wait=None):
+        delays.append(request.headers.get("Delay"))
+        return subprocess.CompletedProcess(args=[], returncode=0, stdout="{}", stderr="")
+
+    monkeypatch.setattr(ntfy_loop, "_send_request", send_request)
+    monkeypatch.setattr(ntfy_loop.time, "time", lambda: 1000.0)
+    looper = NtfyLooper("a", "hi", interval=60, max_iterations=3, backend="schedule", handle_signals=False)
+    looper.run()
+    assert delays == [None, "1060", "1120"]
+    assert looper.success_count == 3
+
+    # Intervals shorter than the server's minimum delay are sent in a loop instead
+    delays.clear()
+    looper = NtfyLooper("a", "hi", interval=0, max_iterations=2, backend="schedule", handle_signals=False)
+    looper.run()
+    assert delays == [None, None]
+
+
+def test_sends_retry_only_responses_the_server_did_not_take(monkeypatch):
+    statuses = []
+
+    def respond(request):
+        status = responses.pop(0)
+        statuses.append(status)
+        return ntfy_loop.httpx.Response(status, text="{}")
+
+    monkeypatch.setattr(ntfy_loop, "_retry_delay", lambda attempt: 0)
+    client = ntfy_loop.httpx.Client(transport=ntfy_loop.httpx.MockTransport(respond))
+    responses = [429, 503, 200]
+    assert ntfy_loop.send_ntfy_message("a", "hi", client=client).returncode == 0
+    assert statuses == [429, 503, 200]
+
+    # The server may have delivered a message that failed with a 500
+    statuses.clear()
+    responses = [500, 200]
+    assert ntfy_loop.send_ntfy_message("a", "hi", client=client).returncode == 22
+    assert statuses == [500]
+
+    statuses.clear()
+    responses = [429] * (ntfy_loop.SEND_RETRIES + 1)
+    assert ntfy_loop.send_ntfy_message("a", "hi", client=client).returncode == 22
+    assert len(statuses) == ntfy_loop.SEND_RETRIES + 1
+
+
+def test_schedule_backend_keeps_delays_above_the_servers_minimum(monkeypatch):
+    clock = [1000.0]
+    delays = []
+
+    def send_request(client, request, wait=None):
+        delays.append(request.headers.get("Delay"))
+        # Each send, with its retries, takes a few seconds
+        clock[0] += 3.25
+        return subprocess.CompletedProcess(args=[], returncode=0, stdout="{}", stderr="")
+
+    monkeypatch.setattr(ntfy_loop, "_send_request", send_request)
+    monkeypatch.setattr(ntfy_loop.time, "time", lambda: clock[0])
+    looper = NtfyLooper("a,b", "hi", interval=10, max_iterations=3, backend="schedule", handle_signals=False)
+    looper.run()
+    # Each delay is at least the minimum after the moment it is sent, rounded up
+    assert delays == [None, None, "1018", "1021", "1024", "1028"]
+
+
+def test_async_loop_without_an_interval_yields_and_caps_messages_in_flight(monkeypatch):
+    active = [0]
+    most = [0]
+
+    async def send(client, request, stop_event=None):
+        active[0] += 1
+        most[0] = max(most[0], active[0])
+        await ntfy_loop.asyncio.sleep(0.001)
+        active[0] -= 1
+        if looper.success_count >= 200:
+            looper.stop()
+        return subprocess.CompletedProcess(args=[], returncode=0, stdout="{}", stderr="")
+
+    monkeypatch.setattr(ntfy_loop, "_send_request_async", send)
+    monkeypatch.setattr(ntfy_loop, "ASYNC_MAX_IN_FLIGHT", 8)
+    looper = NtfyLooper("a", "hi", interval=0, handle_signals=False)
+    thread = threading.Thread(target=ntfy_loop.run_event_loop, args=(looper.run_async(),))
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert looper.success_count >= 200
+    assert most[0] == 8
+
+
+def test_retries_follow_retry_after_and_end_when_the_loop_stops(monkeypatch):
+    responses = []
+    waits = []
+
+    def respond(request):
+        return responses.pop(0)
+
+    client = ntfy_loop.httpx.Client(transport=ntfy_loop.httpx.MockTransport(respond))
+    monkeypatch.setattr(ntfy_loop, "_retry_delay", lambda attempt: pytest.fail("Retry-After should be used"))
+    responses[:] = [ntfy_loop.httpx.Response(429, headers={"Retry-After": "2"}), ntfy_loop.httpx.Response(200)]
+    request = client.build_request("POST", "https://ntfy.sh/a")
+    assert ntfy_loop._send_request(client, request, lambda seconds: waits.append(seconds)).returncode == 0
+    assert waits == [2.0]
+
+    # A longer wait than RETRY_MAX_WAIT isn't waited out
+    responses[:] = [ntfy_loop.httpx.Response(503, headers={"Retry-After": "120"}), ntfy_loop.httpx.Response(200)]
+    assert ntfy_loop._send_request(client, request, lambda seconds: waits.append(seconds)).returncode == 22
+
+    # A stopped loop gives up instead of retrying
+    stopped = threading.Event()
+    stopped.set()
+    responses[:] = [ntfy_loop.httpx.Response(429), ntfy_loop.httpx.Response(200)]
+    monkeypatch.setattr(ntfy_loop, "_retry_delay", lambda attempt: 60)
+    start = time.monotonic()
+    assert ntfy_loop._send_request(client, request, stopped.wait).returncode == 22
+    assert time.monotonic() - start < 1
+    assert waits == [2.0]